@@ -22,14 +22,45 @@ from typing import Dict, Tuple
 import numpy as np
 import pandas as pd
 import sympy as sp
-from scipy.integrate import cumulative_trapezoid
 
-from .viga import Viga, x
+from .viga import (
+    Viga,
+    _CAMPOS_EVALUACION,
+    _bloque_resultados,
+    _evaluar_en_malla,
+    _indices_cercanos,
+    _lambdify_numpy,
+    integrar_momento,
+    integrar_pendiente_deflexion,
+)
 
 # ============================================================
 # GENERACIÓN DE TABLAS DE RESULTADOS
 # ============================================================
 
+# Nombre de columna en las tablas para cada serie de viga.evaluar()
+_COLUMNAS_TABLA = {
+    "x": "x",
+    "V": "cortante",
+    "M": "momento",
+    "theta": "pendiente",
+    "deflexion": "deflexion",
+}
+
+
+def _dataframe_resultados(datos: Dict[str, np.ndarray]) -> pd.DataFrame:
+    """DataFrame (x, cortante, momento, pendiente, deflexion) a partir de viga.evaluar().
+
+    Si las series comparten el bloque (5, n) de ``_empaquetar_resultados``,
+    su traspuesta es ya el bloque interno de pandas y no se copia.
+    """
+    columnas = [_COLUMNAS_TABLA[campo] for campo in _CAMPOS_EVALUACION]
+    bloque = _bloque_resultados(datos)
+    if bloque is not None:
+        return pd.DataFrame(bloque.T, columns=columnas, copy=False)
+    return pd.DataFrame({_COLUMNAS_TABLA[campo]: datos[campo] for campo in _CAMPOS_EVALUACION})
+
+
 def generar_dataframe(viga: Viga, num_puntos: int = 400) -> pd.DataFrame:
     """
     Evalúa la viga y retorna una tabla con todos los resultados.
@@ -46,17 +77,8 @@ def generar_dataframe(viga: Viga, num_puntos: int = 400) -> pd.DataFrame:
         DataFrame con resultados evaluados
     """
     datos = viga.evaluar(num_puntos=num_puntos)
-    df = pd.DataFrame(datos)
-    
-    # Renombrar columnas para claridad
-    columnas = {
-        "V": "cortante",
-        "M": "momento",
-        "theta": "pendiente",
-        "deflexion": "deflexion",
-    }
-    df = df.rename(columns=columnas)
-    return df
+    # Columnas renombradas para claridad (ver _COLUMNAS_TABLA)
+    return _dataframe_resultados(datos)
 
 
 def obtener_maximos(df: pd.DataFrame) -> Dict[str, Tuple[float, float]]:
@@ -111,23 +133,18 @@ def comparar_simbolico_numerico(viga: Viga, num_puntos: int = 400) -> pd.DataFra
     """
     df = generar_dataframe(viga, num_puntos=num_puntos)
     EI = viga.E * viga.I
-    curvatura = df["momento"].to_numpy() / EI
     x_vals = df["x"].to_numpy()
 
-    # Integración numérica usando método del trapecio
-    pendiente_num = cumulative_trapezoid(curvatura, x_vals, initial=0.0)
-    deflexion_num = cumulative_trapezoid(pendiente_num, x_vals, initial=0.0)
-
-    # Ajuste lineal para cumplir condiciones de borde y(0)=y(L)=0
-    # CORRECCIÓN: Solo aplicar si realmente no se cumplen las condiciones (error > 1%)
-    if len(x_vals) > 1:
-        L = x_vals[-1]
-        y_max = np.max(np.abs(deflexion_num))
-        umbral_error = 0.01 * y_max if y_max > 1e-9 else 1e-9
-        
-        # Verificar si necesitamos ajustar (si y(L) no es aproximadamente 0)
-        if abs(deflexion_num[-1]) > umbral_error:
-            deflexion_num -= (x_vals / L) * deflexion_num[-1]
+    # Integración numérica de la curvatura M/EI (Simpson acumulado si SciPy
+    # lo ofrece, trapecios si no) con las mismas condiciones iniciales que la
+    # solución simbólica: θ(0) y y(0) de ésta. Así los errores miden sólo la
+    # integración y no la constante C1 que θ simbólica ya incluye
+    pendiente_num, deflexion_num = integrar_pendiente_deflexion(
+        df["momento"].to_numpy(), x_vals, EI, saltos=viga._saltos_momento()
+    )
+    theta0 = float(df["pendiente"].iloc[0])
+    pendiente_num += theta0
+    deflexion_num += float(df["deflexion"].iloc[0]) + theta0 * (x_vals - x_vals[0])
 
     resultados = pd.DataFrame({
         "x": x_vals,
@@ -156,8 +173,7 @@ def crear_funciones_lambdify(viga: Viga) -> Dict[str, sp.Lambda]:
     Retorna diccionario de funciones que pueden ser llamadas
     directamente con valores numéricos.
     """
-    expresiones = viga.obtener_expresiones()
-    return {nombre: sp.lambdify(x, expr, "numpy") for nombre, expr in expresiones.items()}
+    return viga.obtener_funciones()
 
 
 def discretizar(expr: sp.Expr, L: float, num_puntos: int = 400) -> Tuple[np.ndarray, np.ndarray]:
@@ -177,8 +193,7 @@ def discretizar(expr: sp.Expr, L: float, num_puntos: int = 400) -> Tuple[np.ndar
         Tupla (array_x, array_y) con coordenadas evaluadas
     """
     x_vals = np.linspace(0.0, L, num_puntos)
-    func = sp.lambdify(x, expr, "numpy")
-    valores = func(x_vals)
+    valores = _evaluar_en_malla(_lambdify_numpy(expr), x_vals)
     return x_vals, valores
 
 
@@ -216,7 +231,7 @@ def get_event_positions(viga: Viga) -> Dict[str, np.ndarray]:
         'todos': xs,
         'apoyos': np.array(sorted({float(a.posicion) for a in viga.apoyos}), dtype=float),
         'puntuales': np.array(sorted({float(getattr(c, 'posicion')) for c in viga.cargas if c.__class__.__name__ == 'CargaPuntual'}), dtype=float),
-        'momentos': np.array(sorted({float(getattr(c, 'posicion')) for c in viga.cargas if c.__class__.__name__ == 'CargaMomento'}), dtype=float),
+        'momentos': np.array(sorted({float(c.posicion) for c in viga.cargas_momento}), dtype=float),
         'tramos': np.array(sorted({float(getattr(c, k)) for c in viga.cargas for k in ('inicio','fin') if hasattr(c, k)}), dtype=float),
     }
 
@@ -259,52 +274,28 @@ def muestreo_eventos(viga: Viga, puntos_por_tramo: int = 40, delta_frac: float =
 def evaluar_con_malla(viga: Viga, x_grid: np.ndarray) -> Dict[str, np.ndarray]:
     """
     Evalúa V, M, θ, y sobre una malla arbitraria x_grid.
-    - Usa construcción simbólica de V(x) y evaluación numérica vectorizada
+    - Evalúa V(x) en forma cerrada (Macaulay) o, si no se puede, desde su expresión simbólica
     - Integra numéricamente para M, θ, y
     - Añade saltos de momentos puntuales en M
     - Ajusta y=0 en apoyos
     """
-    import sympy as sp
-    from scipy.integrate import cumulative_trapezoid
-    import numpy as np
-    from .viga import x as x_sym, CargaMomento
-
-    # Cortante simbólico y evaluación numérica
-    V_expr = viga._construir_cortante_expr()
-    V_func = sp.lambdify(x_sym, V_expr, 'numpy')
-    V_vals = np.asarray(V_func(x_grid), dtype=float)
-
-    # Integra para M
-    M_vals = cumulative_trapezoid(V_vals, x_grid, initial=0.0)
-
-    # Añadir saltos de momentos puntuales
+    # Cortante en forma cerrada (Macaulay); si alguna carga no la define,
+    # cortante simbólico lambdificado y memorizado en la viga
+    try:
+        V_vals = viga._cortante_macaulay(x_grid)
+    except NotImplementedError:
+        V_vals = _evaluar_en_malla(viga._funcion_cortante(), x_grid)
+
+    # Integra para M y añade saltos de momentos puntuales en la misma pasada
     # CORRECCIÓN: Aplicar salto directo (suma M0 donde x > a) en lugar de multiplicar por escalón
-    if any(c.__class__.__name__ == 'CargaMomento' for c in viga.cargas):
-        L = float(viga.longitud)
-        tol = max(1e-12, 1e-9 * L)
-        for c in viga.cargas:
-            if c.__class__.__name__ != 'CargaMomento':
-                continue
-            a = float(getattr(c, 'posicion'))
-            # Si momento en apoyo con en_vano=False, omitir salto
-            esta_en_apoyo = any(abs(a - ap.posicion) < 1e-12 for ap in viga.apoyos)
-            en_vano = bool(getattr(c, 'en_vano', True))
-            if esta_en_apoyo and not en_vano:
-                continue
-            
-            # Salto directo: sumar M0 donde x > a (implementación correcta de Heaviside)
-            magnitud = float(getattr(c, 'magnitud'))
-            M_vals[x_grid > (a + tol)] += magnitud
-            
-            # En x = a, sumar M0/2 (convención Heaviside con H(0)=1/2)
-            idx_at_a = np.argmin(np.abs(x_grid - a))
-            if abs(x_grid[idx_at_a] - a) < tol:
-                M_vals[idx_at_a] += magnitud * 0.5
+    # Pares sobre un apoyo con en_vano=False se omiten en _saltos_momento
+    saltos_M = viga._saltos_momento() if viga.cargas_momento else {}
+    tol = max(1e-12, 1e-9 * float(viga.longitud))
+    M_vals = integrar_momento(V_vals, x_grid, saltos_M, tol)
 
     # θ y y
     EI = float(viga.E * viga.I)
-    theta_vals = cumulative_trapezoid(M_vals / EI, x_grid, initial=0.0)
-    y_vals = cumulative_trapezoid(theta_vals, x_grid, initial=0.0)
+    theta_vals, y_vals = integrar_pendiente_deflexion(M_vals, x_grid, EI, saltos=saltos_M)
 
     # Ajuste de condiciones de borde en apoyos
     # Ahora que aplicamos saltos de momentos puntuales ANTES de esta corrección,
@@ -312,8 +303,8 @@ def evaluar_con_malla(viga: Viga, x_grid: np.ndarray) -> Dict[str, np.ndarray]:
     if len(viga.apoyos) >= 2:
         a1 = float(viga.apoyos[0].posicion)
         a2 = float(viga.apoyos[1].posicion)
-        i1 = int(np.argmin(np.abs(x_grid - a1)))
-        i2 = int(np.argmin(np.abs(x_grid - a2)))
+        # Malla creciente: búsqueda binaria en lugar de recorrerla completa
+        i1, i2 = (int(i) for i in _indices_cercanos(x_grid, np.array([a1, a2])))
         x1, x2 = x_grid[i1], x_grid[i2]
         y1, y2 = y_vals[i1], y_vals[i2]
         
@@ -323,7 +314,7 @@ def evaluar_con_malla(viga: Viga, x_grid: np.ndarray) -> Dict[str, np.ndarray]:
             y_vals = y_vals - (y1 + m * (x_grid - x1))
     elif len(viga.apoyos) == 1:
         a = float(viga.apoyos[0].posicion)
-        i0 = int(np.argmin(np.abs(x_grid - a)))
+        i0 = int(_indices_cercanos(x_grid, np.array([a]))[0])
         if abs(y_vals[i0]) > 1e-9:
             y_vals = y_vals - y_vals[i0]
 
@@ -359,12 +350,4 @@ def generar_dataframe_eventos(viga: Viga, puntos_por_tramo: int = 40) -> pd.Data
     # viga.evaluar() automáticamente llama a evaluar_por_subtramos()
     num_puntos_aprox = puntos_por_tramo * max(2, len(viga.apoyos) + len(viga.cargas))
     datos = viga.evaluar(num_puntos=num_puntos_aprox)
-    
-    df = pd.DataFrame({
-        'x': datos['x'],
-        'cortante': datos['V'],
-        'momento': datos['M'],
-        'pendiente': datos['theta'],
-        'deflexion': datos['deflexion'],
-    })
-    return df
+    return _dataframe_resultados(datos)
@@ -25,13 +25,24 @@ SALTOS:
 • Momento puntual: M(x⁺) = M(x⁻) + M_aplicado  (NO afecta V)
 """
 from __future__ import annotations
-from typing import Dict, List, Set
+import warnings
+from functools import lru_cache
+from typing import Dict, List, Set, Tuple
 import numpy as np
 from scipy.integrate import cumulative_trapezoid
-from backend.viga import Viga, CargaPuntual, CargaMomento
+from backend.viga import (
+    Viga,
+    CargaPuntual,
+    _empaquetar_resultados,
+    _indices_cercanos,
+    integrar_momento,
+    integrar_pendiente_deflexion,
+)
 
+TOL_M = 1e-5  # Tolerancia para M en apoyos (10 μN·m)
 
-def H(x, half=False):
+
+def H(x, half=False, out=None):
     """
     Función Heaviside mejorada con opción de H(0) = ½.
     
@@ -42,6 +53,8 @@ def H(x, half=False):
     half : bool, optional
         Si True, usa H(0) = ½ para simetría exacta en discontinuidades
         Si False, usa H(0) = 1 (comportamiento estándar >=)
+    out : np.ndarray, optional
+        Arreglo donde escribir el resultado (puede ser el mismo ``x``)
     
     Returns
     -------
@@ -53,10 +66,8 @@ def H(x, half=False):
     H(0) = ½ mejora la precisión numérica en nudos con discontinuidades,
     reduciendo residuos en el momento M(x) antes de la corrección por vano.
     """
-    x = np.asarray(x)
-    if half:
-        return (x > 0).astype(float) + 0.5 * (x == 0).astype(float)
-    return (x >= 0).astype(float)
+    # Una sola pasada del ufunc, sin máscaras booleanas ni conversiones a float
+    return np.heaviside(np.asarray(x, dtype=float), 0.5 if half else 1.0, out=out)
 
 def obtener_nudos_criticos(viga: Viga) -> np.ndarray:
     """
@@ -174,6 +185,50 @@ def construir_w_total_continua(viga: Viga, x_vals: np.ndarray) -> np.ndarray:
     return w_total
 
 
+@lru_cache(maxsize=32)
+def _malla_global(
+    L_total: float, nudos: Tuple[float, ...], apoyos: Tuple[float, ...], puntos_por_tramo: int
+) -> np.ndarray:
+    """Malla global ordenada y sin duplicados (PASO 2 de ``evaluar_por_subtramos``).
+
+    Memorizada y de sólo lectura: los resultados se copian en su propio
+    bloque (``_empaquetar_resultados``), así que nunca se expone ni modifica.
+    """
+    min_steps = 2400                      # Densidad de malla (ajustable)
+    eps = L_total / min_steps             # Halo alrededor de cada nudo crítico
+    
+    # Nudos y puntos interiores de cada tramo como bloques de arreglo; la
+    # unión se ordena y depura una sola vez al final
+    nudos = np.asarray(nudos, dtype=float)
+    pos_apoyos = np.asarray(apoyos, dtype=float)
+    piezas = [nudos]
+    for left, right in zip(nudos[:-1], nudos[1:]):
+        # Inserta halo a la derecha de x_i y a la izquierda de x_ip1
+        hL = left + eps
+        hR = right - eps
+        
+        if hL < hR:
+            # Densidad base proporcional al tamaño del tramo
+            n_internos = max(1, int(puntos_por_tramo * (right - left) / L_total))
+            piezas.append(np.linspace(hL, hR, n_internos))
+    
+    # ─────────────────────────────────────────────────────────────────────────
+    # Refinado adicional en apoyos (captura saltos de V con mayor precisión)
+    # ─────────────────────────────────────────────────────────────────────────
+    # 3 puntos antes y 3 después de cada apoyo (dentro del halo)
+    desplazamientos = np.array([0.5, 1.0, 1.5]) * eps
+    cerca_apoyos = np.concatenate([
+        (pos_apoyos[:, None] + desplazamientos).ravel(),
+        (pos_apoyos[:, None] - desplazamientos).ravel(),
+    ])
+    piezas.append(cerca_apoyos[(cerca_apoyos >= 0.0) & (cerca_apoyos <= L_total)])
+    
+    # Ordenar y eliminar duplicados numéricos (redondeo a 12 decimales)
+    x_grid = np.unique(np.round(np.concatenate(piezas), 12))
+    x_grid.setflags(write=False)
+    return x_grid
+
+
 def evaluar_por_subtramos(viga: Viga, puntos_por_tramo: int = 50) -> Dict[str, np.ndarray]:
     """
     Evalúa V(x), M(x), θ(x), y(x) usando método ESTRICTAMENTE GLOBAL.
@@ -192,6 +247,10 @@ def evaluar_por_subtramos(viga: Viga, puntos_por_tramo: int = 50) -> Dict[str, n
     8. θ(x) = ∫(M/EI) dx, y(x) = ∫θ dx
     9. Ajustar y=0 en apoyos
     
+    Si todas las cargas definen sus términos de Macaulay (y hay al menos dos
+    apoyos), los pasos 3 a 9 se sustituyen por la evaluación exacta de V, M,
+    θ y y en la malla (``Viga._campos_macaulay``).
+    
     Ventajas:
     ---------
     ✓ Sin bucles por tramos
@@ -217,7 +276,6 @@ def evaluar_por_subtramos(viga: Viga, puntos_por_tramo: int = 50) -> Dict[str, n
     # PASO 1: Nudos críticos SIN DUPLICADOS
     # ═══════════════════════════════════════════════════════════════════════════
     nudos = obtener_nudos_criticos(viga)
-    n_nudos = len(nudos)
     
     # ═══════════════════════════════════════════════════════════════════════════
     # PASO 2: Grid global refinado con halos ±ε en discontinuidades
@@ -228,60 +286,99 @@ def evaluar_por_subtramos(viga: Viga, puntos_por_tramo: int = 50) -> Dict[str, n
     # min_steps controla la finura del halo (mayor → más denso cerca de nudos)
     # Recomendado: 2400-4000 para balance precisión/rendimiento
     
-    min_steps = 2400                      # Densidad de malla (ajustable)
-    L_total = float(viga.longitud)
-    eps = L_total / min_steps             # Halo alrededor de cada nudo crítico
+    # La malla sólo depende de L, nudos, apoyos y densidad: memorizada
+    # (sólo lectura) para las reejecuciones de la UI con la misma geometría
+    x_grid = _malla_global(
+        float(viga.longitud), tuple(nudos.tolist()), tuple(viga._apoyo_pos.tolist()), puntos_por_tramo
+    )
     
-    x_grid = []
+    # ═══════════════════════════════════════════════════════════════════════════
+    # PASO 3: Calcular reacciones (equilibrio global, no por tramos)
+    # ═══════════════════════════════════════════════════════════════════════════
+    reacciones = viga.calcular_reacciones()
     
-    for i in range(n_nudos - 1):
-        x_i = nudos[i]
-        x_ip1 = nudos[i + 1]
-        
-        # Inserta halo a la derecha de x_i y a la izquierda de x_ip1
-        left = x_i
-        right = x_ip1
-        
-        # Añadir nudo izquierdo
-        x_grid.append(float(left))
-        
-        # Añadir puntos de halo si caben dentro del tramo
-        hL = left + eps
-        hR = right - eps
-        
-        if hL < hR:
-            # Densidad base proporcional al tamaño del tramo
-            n_internos = max(1, int(puntos_por_tramo * (right - left) / L_total))
-            internos = np.linspace(hL, hR, n_internos)
-            x_grid.extend(internos.tolist())
+    # ═══════════════════════════════════════════════════════════════════════════
+    # PASOS 4-10: V(x), M(x), θ(x), y(x)
+    # ═══════════════════════════════════════════════════════════════════════════
+    # V y M son polinomios por tramos: con los términos de Macaulay de cada
+    # carga los cuatro campos son exactos en cada nodo, sin integración
+    # numérica ni correcciones afines (que además anulaban el momento de
+    # continuidad en apoyos intermedios). Si alguna carga no define sus
+    # términos o hay menos de dos apoyos se integra numéricamente.
+    try:
+        V_vals, M_vals, theta_vals, y_vals = viga._campos_macaulay(x_grid)
+        # Par exactamente sobre un nodo: H(0)=1/2, mitad del salto (como la
+        # integración numérica); los pares en apoyo con en_vano=False no saltan.
+        # La malla está redondeada a 12 decimales: el nodo puede quedar justo
+        # antes de la posición del par, donde el escalón aún no se aplicó
+        for carga in viga.cargas_momento:
+            if viga._en_apoyo(carga.posicion) and not carga.en_vano:
+                continue
+            idxs_m = np.flatnonzero(np.isclose(x_grid, carga.posicion, atol=1e-12))
+            if idxs_m.size > 0:
+                i = idxs_m[0]
+                medio_salto = 0.5 * float(carga.magnitud)
+                M_vals[i] += -medio_salto if x_grid[i] >= carga.posicion else medio_salto
+    except NotImplementedError:
+        V_vals, M_vals, theta_vals, y_vals = _integrar_numericamente(viga, x_grid, reacciones)
     
-    # Último nudo
-    x_grid.append(float(nudos[-1]))
+    # ═══════════════════════════════════════════════════════════════════════════
+    # PASO 11: Verificaciones finales (diagnóstico)
+    # ═══════════════════════════════════════════════════════════════════════════
+    # Tolerancias relajadas para compatibilidad con mallas variadas
+    TOL_V = 1e-5  # Tolerancia para V(L) (10 μN)
+    L_viga = float(viga.longitud)
     
-    # Eliminar posibles duplicados numéricos (redondeo a 12 decimales)
-    x_grid = np.array(sorted(set(np.round(x_grid, 12))))
+    # Verificar V(L) ≈ 0 solo si NO es voladizo y no hay carga puntual en L
+    pos_apoyos_sorted = viga._apoyo_pos
+    hay_voladizo = pos_apoyos_sorted.size > 0 and abs(pos_apoyos_sorted[-1] - L_viga) > 1e-9
+    hay_puntual_en_L = any(
+        isinstance(c, CargaPuntual) and abs(c.posicion - L_viga) < 1e-12
+        for c in viga.cargas
+    )
     
-    # ─────────────────────────────────────────────────────────────────────────
-    # Refinado adicional en apoyos (captura saltos de V con mayor precisión)
-    # ─────────────────────────────────────────────────────────────────────────
-    for ap in viga.apoyos:
-        xa = float(ap.posicion)
-        # Añadir 3 puntos antes y 3 después del apoyo (dentro del halo)
-        for d in (0.5*eps, 1.0*eps, 1.5*eps):
-            if 0.0 <= xa + d <= L_total:
-                x_grid = np.append(x_grid, xa + d)
-            if 0.0 <= xa - d <= L_total:
-                x_grid = np.append(x_grid, xa - d)
-    
-    # Reordenar y eliminar duplicados finales
-    x_grid = np.array(sorted(set(np.round(x_grid, 12))))
-    n_puntos = len(x_grid)
+    # Solo verificar V(L)≈0 si el extremo está apoyado (no es voladizo)
+    if not hay_voladizo and not hay_puntual_en_L:
+        if abs(V_vals[-1]) > TOL_V:
+            warnings.warn(
+                f"⚠️ V(L) = {V_vals[-1]:.3e} N (esperado ≈0). "
+                f"Posible error en equilibrio global."
+            )
+    
+    # Verificar M(L) ≈ 0 (si hay apoyo en L o extremo libre)
+    hay_apoyo_en_L = viga._en_apoyo(L_viga, tol=1e-9)
+    hay_momento_en_L = any(abs(c.posicion - L_viga) < 1e-12 for c in viga.cargas_momento)
+    
+    if (hay_apoyo_en_L or not viga.apoyos) and not hay_momento_en_L:
+        if abs(M_vals[-1]) > TOL_M:
+            warnings.warn(
+                f"⚠️ M(L) = {M_vals[-1]:.3e} N·m (esperado ≈0). "
+                f"Revisar reacciones en sistemas hiperestáticos."
+            )
     
     # ═══════════════════════════════════════════════════════════════════════════
-    # PASO 3: Calcular reacciones (equilibrio global, no por tramos)
+    # RESULTADO: Retornar arrays calculados
     # ═══════════════════════════════════════════════════════════════════════════
-    reacciones = viga.calcular_reacciones()
+    # ✅ Método estrictamente global (sin sub-tramos)
+    # ✅ w_total(x) continua (todas las distribuidas sumadas)
+    # ✅ V(x) con Heaviside + integración global única
+    # ✅ M(x) con integración global única + saltos de M₀
+    # ✅ Forma cerrada exacta cuando todas las cargas definen sus términos
+    # ✅ Sin nudos duplicados
+    # ✅ Sin reinicios de integración
     
+    # Las cinco series en un único bloque contiguo (ver _empaquetar_resultados)
+    return _empaquetar_resultados(x_grid, V_vals, M_vals, theta_vals, y_vals)
+
+
+def _integrar_numericamente(
+    viga: Viga, x_grid: np.ndarray, reacciones: Dict[str, float]
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Pasos 4 a 10 de ``evaluar_por_subtramos`` por integración numérica global.
+
+    Se usa cuando alguna carga no define ``deflection_terms`` o la viga tiene
+    menos de dos apoyos. Devuelve (V, M, θ, y) sobre ``x_grid``.
+    """
     # ═══════════════════════════════════════════════════════════════════════════
     # PASO 4: Construir w_total(x) continua (UNA SOLA FUNCIÓN)
     # ═══════════════════════════════════════════════════════════════════════════
@@ -296,20 +393,26 @@ def evaluar_por_subtramos(viga: Viga, puntos_por_tramo: int = 50) -> Dict[str, n
     # Usamos H(0)=1 (comportamiento estándar) para que los saltos de V sean
     # claramente visibles en la tabla de resultados desde el primer punto.
     
-    V_vals = np.zeros(n_puntos, dtype=float)
+    V_vals = np.zeros(x_grid.size, dtype=float)
+    # Un único búfer de trabajo para todos los escalones (sin temporales por carga)
+    trabajo = np.empty_like(V_vals)
     
     # Saltos por REACCIONES (hacia arriba → positivo)
     # Usar H(0)=1 para que V(apoyo) = R_A directamente (mejor para visualización)
     for apoyo in viga.apoyos:
         R_y = float(reacciones[apoyo.nombre])
-        V_vals += R_y * H(x_grid - apoyo.posicion, half=False)
+        H(np.subtract(x_grid, apoyo.posicion, out=trabajo), half=False, out=trabajo)
+        trabajo *= R_y
+        V_vals += trabajo
     
     # Saltos por CARGAS PUNTUALES (hacia abajo → negativo)
     # Usar H(0)=1 para que el salto se vea claramente en la tabla
     for carga in viga.cargas:
         if isinstance(carga, CargaPuntual):
             P = float(carga.magnitud)
-            V_vals -= P * H(x_grid - carga.posicion, half=False)
+            H(np.subtract(x_grid, carga.posicion, out=trabajo), half=False, out=trabajo)
+            trabajo *= P
+            V_vals -= trabajo
     
     # Integral de w_total (UNA SOLA VEZ)
     integral_w = cumulative_trapezoid(w_vals, x_grid, initial=0.0)
@@ -325,32 +428,12 @@ def evaluar_por_subtramos(viga: Viga, puntos_por_tramo: int = 50) -> Dict[str, n
     # - Integración continua sin reinicios
     # - Corrección afín ÚNICA por vano después
     
-    # Integrar V(x) globalmente (UNA SOLA VEZ)
-    M_vals = cumulative_trapezoid(V_vals, x_grid, initial=0.0)
-    
-    # Saltos por MOMENTOS PUNTUALES
-    for carga in viga.cargas:
-        if isinstance(carga, CargaMomento):
-            x_m = float(carga.posicion)
-            M0 = float(carga.magnitud)
-            
-            # Verificar si está en apoyo y si debe aplicarse en el vano
-            esta_en_apoyo = any(abs(x_m - ap.posicion) < 1e-12 for ap in viga.apoyos)
-            en_vano = getattr(carga, 'en_vano', True)
-            
-            # Aplicar salto solo si no está en apoyo o si en_vano=True
-            if not esta_en_apoyo or en_vano:
-                # Buscar índice exacto del momento
-                idxs_m = np.where(np.isclose(x_grid, x_m, atol=1e-12))[0]
-                
-                if idxs_m.size > 0:
-                    idx_m = idxs_m[0]
-                    # Heaviside con H(0) = 1/2
-                    M_vals[idx_m] += M0 * 0.5
-                    M_vals[idx_m+1:] += M0
-                else:
-                    # Si no está en grid exacto, salto para x > x_m
-                    M_vals[x_grid > x_m] += M0
+    # Integrar V(x) globalmente (UNA SOLA VEZ) y sumar los saltos por MOMENTOS
+    # PUNTUALES en el mismo cumsum: M0 desde el primer nodo con x > x_m y
+    # M0/2 (Heaviside con H(0) = 1/2) en el nodo que coincide con x_m, sin
+    # máscaras ni temporales por par. _saltos_momento ya omite los pares
+    # sobre un apoyo con en_vano=False.
+    M_vals = integrar_momento(V_vals, x_grid, viga._saltos_momento(), tol=1e-12)
     
     # ═══════════════════════════════════════════════════════════════════════════
     # PASO 7: Corrección afín POR VANO (M=0 en cada vano entre apoyos consecutivos)
@@ -360,18 +443,18 @@ def evaluar_por_subtramos(viga: Viga, puntos_por_tramo: int = 50) -> Dict[str, n
     # NO tocar voladizos fuera de los apoyos extremos
     
     if len(viga.apoyos) >= 3:  # ← CAMBIO CRÍTICO: solo para sistemas hiperestáticos
-        # Ordenar apoyos por posición (crítico para vanos consecutivos)
-        pos_apoyos_orden = sorted([float(ap.posicion) for ap in viga.apoyos])
+        # Posiciones de apoyos ya ordenadas (la viga mantiene _apoyo_pos ordenado)
+        pos_apoyos_orden = viga._apoyo_pos
+        # Índices de los apoyos en el grid (búsqueda binaria, grid ordenado)
+        idx_orden = _indices_cercanos(x_grid, pos_apoyos_orden)
         
         # Iterar sobre cada vano [apoyo_i, apoyo_i+1]
-        for xa, xb in zip(pos_apoyos_orden[:-1], pos_apoyos_orden[1:]):
+        for k, (xa, xb) in enumerate(zip(pos_apoyos_orden[:-1], pos_apoyos_orden[1:])):
             # Saltar vanos degenerados (apoyos muy cercanos)
             if abs(xb - xa) <= 1e-12:
                 continue
             
-            # Índices de los apoyos en el grid
-            ia = np.argmin(np.abs(x_grid - xa))
-            ib = np.argmin(np.abs(x_grid - xb))
+            ia, ib = idx_orden[k], idx_orden[k + 1]
             
             # Valores de M en los extremos del vano
             Ma = M_vals[ia]
@@ -388,23 +471,18 @@ def evaluar_por_subtramos(viga: Viga, puntos_por_tramo: int = 50) -> Dict[str, n
     # ═══════════════════════════════════════════════════════════════════════════
     # Solo verificar M≈0 en APOYOS EXTREMOS de sistemas isostáticos
     # En apoyos intermedios con voladizo, M puede ser ≠0 (momento de continuidad)
-    TOL_M = 1e-5  # Tolerancia para M en apoyos (10 μN·m)
-    
     # Solo verificar si es sistema isostático (2 apoyos)
     if len(viga.apoyos) == 2:
-        pos_apoyos_orden = sorted([float(ap.posicion) for ap in viga.apoyos])
         L_viga = float(viga.longitud)
+        idx_apoyos = _indices_cercanos(x_grid, viga._apoyo_pos)
         
         # Verificar M≈0 solo en apoyos que coinciden con extremos de la viga
-        for apoyo in viga.apoyos:
-            pos = float(apoyo.posicion)
+        for apoyo, pos, idx_ap in zip(viga.apoyos, viga._apoyo_pos, idx_apoyos):
             es_extremo = (abs(pos - 0.0) < 1e-9) or (abs(pos - L_viga) < 1e-9)
             
             if es_extremo:
-                idx_ap = np.argmin(np.abs(x_grid - pos))
                 M_apoyo = M_vals[idx_ap]
                 if abs(M_apoyo) > TOL_M:
-                    import warnings
                     warnings.warn(
                         f"⚠️ M({apoyo.nombre}) = {M_apoyo:.3e} N·m (esperado ≈0). "
                         f"Posible error numérico en apoyo extremo."
@@ -412,11 +490,10 @@ def evaluar_por_subtramos(viga: Viga, puntos_por_tramo: int = 50) -> Dict[str, n
     
     # Para sistemas hiperestáticos (3+ apoyos), verificar todos los apoyos
     elif len(viga.apoyos) >= 3:
-        for apoyo in viga.apoyos:
-            idx_ap = np.argmin(np.abs(x_grid - apoyo.posicion))
+        idx_apoyos = _indices_cercanos(x_grid, viga._apoyo_pos)
+        for apoyo, idx_ap in zip(viga.apoyos, idx_apoyos):
             M_apoyo = M_vals[idx_ap]
             if abs(M_apoyo) > TOL_M:
-                import warnings
                 warnings.warn(
                     f"⚠️ M({apoyo.nombre}) = {M_apoyo:.3e} N·m (esperado ≈0). "
                     f"Revisar reacciones en sistemas hiperestáticos."
@@ -427,11 +504,10 @@ def evaluar_por_subtramos(viga: Viga, puntos_por_tramo: int = 50) -> Dict[str, n
     # ═══════════════════════════════════════════════════════════════════════════
     EI = float(viga.E * viga.I)
     
-    # θ(x) = ∫₀ˣ [M(ξ)/EI] dξ
-    theta_vals = cumulative_trapezoid(M_vals / EI, x_grid, initial=0.0)
-    
-    # y(x) = ∫₀ˣ θ(ξ) dξ
-    y_vals = cumulative_trapezoid(theta_vals, x_grid, initial=0.0)
+    # θ(x) = ∫₀ˣ [M(ξ)/EI] dξ  y  y(x) = ∫₀ˣ θ(ξ) dξ  (Simpson salvo junto a los pares)
+    theta_vals, y_vals = integrar_pendiente_deflexion(
+        M_vals, x_grid, EI, saltos=viga._saltos_momento()
+    )
     
     # ═══════════════════════════════════════════════════════════════════════════
     # PASO 10: Corrección afín ÚNICA para y=0 en apoyos extremos (ORDENADOS)
@@ -439,14 +515,12 @@ def evaluar_por_subtramos(viga: Viga, puntos_por_tramo: int = 50) -> Dict[str, n
     # Asegurar que usamos apoyos extremos independientemente del orden en la lista
     
     if len(viga.apoyos) >= 2:
-        # Ordenar apoyos por posición (crítico si la lista viene desordenada)
-        pos_apoyos_orden = sorted([float(ap.posicion) for ap in viga.apoyos])
-        x_izq = pos_apoyos_orden[0]
-        x_der = pos_apoyos_orden[-1]
+        # Apoyos extremos: _apoyo_pos está ordenado aunque la lista no lo estuviera
+        x_izq = float(viga._apoyo_pos[0])
+        x_der = float(viga._apoyo_pos[-1])
         
         # Índices de los apoyos extremos en el grid
-        idx_izq = np.argmin(np.abs(x_grid - x_izq))
-        idx_der = np.argmin(np.abs(x_grid - x_der))
+        idx_izq, idx_der = _indices_cercanos(x_grid, np.array([x_izq, x_der]))
         
         y_izq = y_vals[idx_izq]
         y_der = y_vals[idx_der]
@@ -456,60 +530,4 @@ def evaluar_por_subtramos(viga: Viga, puntos_por_tramo: int = 50) -> Dict[str, n
             pendiente_y = (y_der - y_izq) / (x_der - x_izq)
             y_vals -= (y_izq + pendiente_y * (x_grid - x_izq))
     
-    # ═══════════════════════════════════════════════════════════════════════════
-    # PASO 11: Verificaciones finales (diagnóstico)
-    # ═══════════════════════════════════════════════════════════════════════════
-    # Tolerancias relajadas para compatibilidad con mallas variadas
-    TOL_V = 1e-5  # Tolerancia para V(L) (10 μN)
-    L_viga = float(viga.longitud)
-    
-    # Verificar V(L) ≈ 0 solo si NO es voladizo y no hay carga puntual en L
-    pos_apoyos_sorted = sorted([float(ap.posicion) for ap in viga.apoyos])
-    hay_voladizo = len(pos_apoyos_sorted) > 0 and abs(pos_apoyos_sorted[-1] - L_viga) > 1e-9
-    hay_puntual_en_L = any(
-        isinstance(c, CargaPuntual) and abs(c.posicion - L_viga) < 1e-12
-        for c in viga.cargas
-    )
-    
-    # Solo verificar V(L)≈0 si el extremo está apoyado (no es voladizo)
-    if not hay_voladizo and not hay_puntual_en_L:
-        if abs(V_vals[-1]) > TOL_V:
-            import warnings
-            warnings.warn(
-                f"⚠️ V(L) = {V_vals[-1]:.3e} N (esperado ≈0). "
-                f"Posible error en equilibrio global."
-            )
-    
-    # Verificar M(L) ≈ 0 (si hay apoyo en L o extremo libre)
-    hay_apoyo_en_L = any(abs(ap.posicion - L_viga) < 1e-9 for ap in viga.apoyos)
-    hay_momento_en_L = any(
-        isinstance(c, CargaMomento) and abs(c.posicion - L_viga) < 1e-12
-        for c in viga.cargas
-    )
-    
-    if (hay_apoyo_en_L or not viga.apoyos) and not hay_momento_en_L:
-        if abs(M_vals[-1]) > TOL_M:
-            import warnings
-            warnings.warn(
-                f"⚠️ M(L) = {M_vals[-1]:.3e} N·m (esperado ≈0). "
-                f"Revisar reacciones en sistemas hiperestáticos."
-            )
-    
-    # ═══════════════════════════════════════════════════════════════════════════
-    # RESULTADO: Retornar arrays calculados
-    # ═══════════════════════════════════════════════════════════════════════════
-    # ✅ Método estrictamente global (sin sub-tramos)
-    # ✅ w_total(x) continua (todas las distribuidas sumadas)
-    # ✅ V(x) con Heaviside + integración global única
-    # ✅ M(x) con integración global única + saltos de M₀
-    # ✅ Corrección afín única por vano (M=0 en apoyos)
-    # ✅ Sin nudos duplicados
-    # ✅ Sin reinicios de integración
-    
-    return {
-        'x': x_grid,
-        'V': V_vals,
-        'M': M_vals,
-        'theta': theta_vals,
-        'deflexion': y_vals
-    }
+    return V_vals, M_vals, theta_vals, y_vals
@@ -201,7 +201,7 @@ def _resolver_viga(viga: Viga) -> None:
 
     exportar = _solicitar_opcion("\n¿Desea exportar resultados y gráficas? (s/n): ", ("s", "n"))
     if exportar == "s":
-        ruta_tabla = utils.exportar_tabla(df, "resultados_viga")
+        ruta_tabla = utils.exportar_tabla_rapido(df, "resultados_viga")
         print(f"📝 Tabla guardada en {ruta_tabla}")
         for nombre, figura in figuras.items():
             ruta = utils.exportar_grafica(figura, nombre)
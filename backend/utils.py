@@ -10,6 +10,7 @@ UTILIDADES DE EXPORTACIÓN
 
 Funciones principales:
   - exportar_tabla(): Guarda DataFrame como CSV
+  - exportar_tabla_rapido(): CSV rápido para tablas de resultados
   - exportar_grafica(): Guarda gráficas como PNG
   - exportar_configuracion(): Guarda configuración completa en JSON
   - convertir_dataframe_export(): Cambia unidades en resultados
@@ -18,8 +19,9 @@ Funciones principales:
 from __future__ import annotations
 
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import IO, List, Dict, Any, Optional
 import json
+import os
 from datetime import datetime
 
 from .viga import (
@@ -31,6 +33,7 @@ from .viga import (
     Carga,
 )
 
+import numpy as np
 import pandas as pd
 
 from .units import LENGTH_UNITS, FORCE_UNITS, DEFLEXION_DISPLAY
@@ -39,6 +42,12 @@ from .units import LENGTH_UNITS, FORCE_UNITS, DEFLEXION_DISPLAY
 OUTPUT_DIR = Path("outputs")
 GRAFICAS_DIR = OUTPUT_DIR / "graficas"
 
+# Búfer de escritura para CSV/JSON (1 MiB)
+_BUFFER_ESCRITURA = 1 << 20
+
+# Columnas de la tabla de resultados (todas float64)
+COLUMNAS_RESULTADOS = ("x", "cortante", "momento", "pendiente", "deflexion")
+
 # ============================================================
 # FUNCIONES DE EXPORTACIÓN BÁSICAS
 # ============================================================
@@ -49,6 +58,22 @@ def asegurar_directorios() -> None:
     GRAFICAS_DIR.mkdir(exist_ok=True, parents=True)
 
 
+def _abrir_escritura(
+    ruta: Path, encoding: str = "utf-8", newline: Optional[str] = None
+) -> IO[str]:
+    """
+    Abre (o trunca) un archivo de texto para escritura con un búfer grande.
+    
+    Usa os.open directamente con O_WRONLY|O_CREAT|O_TRUNC: una sola llamada
+    al sistema crea el archivo, sin las comprobaciones extra de Path.open.
+    ``newline`` se pasa tal cual a os.fdopen: los escritores CSV necesitan
+    newline="" (ponen ellos los finales de línea); el JSON conserva la
+    traducción por defecto de la plataforma, como open(ruta, "w").
+    """
+    fd = os.open(os.fspath(ruta), os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    return os.fdopen(fd, "w", buffering=_BUFFER_ESCRITURA, encoding=encoding, newline=newline)
+
+
 def exportar_tabla(dataframe: pd.DataFrame, nombre: str) -> Path:
     """
     Guarda un DataFrame como archivo CSV.
@@ -59,7 +84,45 @@ def exportar_tabla(dataframe: pd.DataFrame, nombre: str) -> Path:
     """
     asegurar_directorios()
     ruta = OUTPUT_DIR / f"{nombre}.csv"
-    dataframe.to_csv(ruta, index=False)
+    with _abrir_escritura(ruta, newline="") as f:
+        dataframe.to_csv(f, index=False, chunksize=65536)
+    return ruta
+
+
+def exportar_tabla_rapido(
+    dataframe: pd.DataFrame, nombre: str, formato: str = "%.6g"
+) -> Path:
+    """
+    Guarda una tabla de resultados como CSV usando np.savetxt.
+    
+    Para el esquema conocido (x, cortante, momento, pendiente, deflexion,
+    todas float64) escribe la matriz numérica de una sola vez, sin el
+    escritor genérico de pandas. Cualquier otra tabla usa exportar_tabla().
+    
+    Uso:
+        ruta = exportar_tabla_rapido(df, "resultados_viga")
+        → Crea: outputs/resultados_viga.csv
+    """
+    columnas = list(dataframe.columns)
+    es_resultado = (
+        len(columnas) > 0
+        and set(columnas) <= set(COLUMNAS_RESULTADOS)
+        and all(dataframe[c].dtype == np.float64 for c in columnas)
+    )
+    if not es_resultado:
+        return exportar_tabla(dataframe, nombre)
+
+    asegurar_directorios()
+    ruta = OUTPUT_DIR / f"{nombre}.csv"
+    with _abrir_escritura(ruta, newline="") as f:
+        np.savetxt(
+            f,
+            dataframe.to_numpy(),
+            fmt=formato,
+            delimiter=",",
+            header=",".join(columnas),
+            comments="",
+        )
     return ruta
 
 
@@ -239,7 +302,7 @@ def exportar_configuracion(
     }
     
     # Guardar JSON con formato legible
-    with ruta.open("w", encoding="utf-8") as f:
+    with _abrir_escritura(ruta) as f:
         json.dump(data, f, indent=2, ensure_ascii=False)
     
     return ruta
@@ -63,15 +63,34 @@ HIPÓTESIS DEL MODELO:
 """
 from __future__ import annotations
 
-from dataclasses import dataclass, field
-from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Tuple
+import hashlib
+import importlib.util
+import inspect
+import os
+import stat
+import sys
+import warnings
+from collections import OrderedDict
+from dataclasses import dataclass, field, fields
+from functools import lru_cache
+from typing import Any, Callable, ClassVar, Dict, List, Optional, Tuple
 
 import numpy as np
-import pandas as pd
 import sympy as sp
+from sympy.core.cache import clear_cache
 
-if TYPE_CHECKING:
-    from backend.calculos import generar_dataframe
+try:  # Numba es opcional: sin él se usan funciones NumPy de lambdify
+    import numba
+
+    _NUMBA_DISPONIBLE = True
+except Exception:  # pragma: no cover - entornos sin numba
+    numba = None  # type: ignore
+    _NUMBA_DISPONIBLE = False
+
+try:  # cumulative_simpson existe desde SciPy 1.12; antes se integra por trapecios
+    from scipy.integrate import cumulative_simpson
+except ImportError:  # pragma: no cover - SciPy < 1.12
+    cumulative_simpson = None  # type: ignore
 
 # Clases exportadas (disponibles cuando se importa este módulo)
 __all__ = [
@@ -136,23 +155,671 @@ def macaulay(variable: sp.Symbol, offset: float, exponent: int) -> sp.Expr:
     return sp.Pow(variable - offset, exponent) * heaviside(variable - offset)
 
 
-def _import_generar_dataframe():
-    """Importa función generar_dataframe cuando se necesita (evita problemas circulares)."""
+def macaulay_np(x_vals: np.ndarray, offset: float, exponent: int) -> np.ndarray:
+    """Versión numérica de <x - a>^n (n ≥ 1) para evaluar fórmulas cerradas."""
+    return np.maximum(x_vals - offset, 0.0) ** exponent
+
+
+def _sumar_macaulay(
+    x_vals: np.ndarray, coef: np.ndarray, offset: np.ndarray, exponente: np.ndarray
+) -> np.ndarray:
+    """Σ_k coef_k·<x - offset_k>^n_k para todos los x en un solo *broadcast*.
+
+    Los términos llegan como estructura de arreglos (uno por término), así
+    que no hay despacho por carga en Python: la suma es (n_x, n_terminos) → n_x.
+    Las potencias se calculan en el mismo arreglo de trabajo y la suma
+    ponderada es un producto matriz-vector (sin más temporales n_x × n_terminos).
+    """
+    x_vals = np.asarray(x_vals, dtype=float)
+    base = np.subtract(x_vals[..., None], offset)
+    np.maximum(base, 0.0, out=base)
+    np.power(base, exponente, out=base)
+    return base @ coef
+
+
+def _derivar_macaulay(
+    coef: np.ndarray, offset: np.ndarray, exponente: np.ndarray, orden: int
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Términos de la derivada ``orden``-ésima de Σ coef·<x-a>^n.
+
+    d/dx <x-a>^n = n<x-a>^(n-1); los términos que bajarían de exponente 0
+    (deltas de Dirac) se descartan.
+    """
+    factor = np.ones_like(coef)
+    for j in range(orden):
+        factor = factor * (exponente - j)
+    quedan = exponente >= orden
+    return (coef * factor)[quedan], offset[quedan], (exponente - orden)[quedan]
+
+
+def _sumar_escalones_macaulay(
+    x_vals: np.ndarray, coef: np.ndarray, offset: np.ndarray, exponente: np.ndarray
+) -> np.ndarray:
+    """Como ``_sumar_macaulay`` pero con <x-a>⁰ = H(x-a) y H(0)=1 (no 0⁰ = 1 para x < a)."""
+    x_vals = np.asarray(x_vals, dtype=float)
+    if _NUMBA_DISPONIBLE and x_vals.ndim == 1:
+        return _kernel_escalones_macaulay(
+            np.ascontiguousarray(x_vals), coef, offset, exponente
+        )
+    dif = np.subtract(x_vals[..., None], offset)
+    activo = dif >= 0.0
+    np.maximum(dif, 0.0, out=dif)
+    np.power(dif, exponente, out=dif)
+    dif *= activo
+    return dif @ coef
+
+
+# ============================================================
+# CONTRIBUCIONES AL CORTANTE (memorizadas)
+# ============================================================
+# Las expresiones de SymPy son inmutables: dos cargas con los mismos
+# parámetros pueden compartir el mismo objeto sin riesgo. Esto evita
+# reconstruir el árbol cada vez que se arma V(x).
+
+
+@lru_cache(maxsize=256)
+def _cortante_uniforme(variable: sp.Symbol, intensidad: float, inicio: float, fin: float) -> sp.Expr:
+    """Contribución al cortante de una carga uniforme w en [inicio, fin]."""
+    return (
+        -intensidad * macaulay(variable, inicio, 1)
+        + intensidad * macaulay(variable, fin, 1)
+    )
+
+
+@lru_cache(maxsize=256)
+def _cortante_trapezoidal(
+    variable: sp.Symbol, w1: float, w2: float, a: float, b: float
+) -> sp.Expr:
+    """Contribución al cortante de una carga lineal w1 → w2 en [a, b].
+
+    Suma de monomios de Macaulay, ya en forma canónica: no requiere simplify.
+    q(x) = w1<x-a>⁰ + k<x-a>¹ - w2<x-b>⁰ - k<x-b>¹  →  V = -∫q dx
+    """
+    k = (w2 - w1) / (b - a)
+    return sp.Add(
+        -w1 * macaulay(variable, a, 1),
+        -k / 2 * macaulay(variable, a, 2),
+        w2 * macaulay(variable, b, 1),
+        k / 2 * macaulay(variable, b, 2),
+    )
+
+
+def _funcion_constante(expr: sp.Expr) -> Optional[Callable]:
+    """Función que rellena la malla con ``float(expr)`` si ``expr`` no depende de x.
+
+    Caso de la viga sin cargas (V=M=θ=y=0): se evita generar código y, con
+    numba, compilar una ufunc para devolver un valor fijo.
+    """
+    if expr.free_symbols:
+        return None
     try:
-        from backend.calculos import generar_dataframe
-        return generar_dataframe
-    except ImportError as e:
-        raise ImportError(
-            f"No se pudo importar generar_dataframe: {e}. "
-            "Asegúrate de que backend/calculos.py esté disponible."
+        valor = float(expr)
+    except TypeError:
+        return None
+    return lambda xs: np.full_like(np.asarray(xs, dtype=float), valor)
+
+
+@lru_cache(maxsize=128)
+def _lambdificar(expr: sp.Expr) -> Callable:
+    """Convierte una expresión en x en una función vectorizada sobre arreglos.
+
+    Con numba disponible se genera la versión escalar (módulo ``math``) y se
+    compila como ufunc (``fastmath``, caché en disco): los términos de cada
+    punto se evalúan en una sola pasada, sin arreglos temporales por carga.
+    Heaviside se reescribe antes como Piecewise para conservar su valor en el
+    salto (H(0)). Si numba no está o la compilación falla, se usa lambdify de
+    NumPy con CSE.
+
+    Memorizada por expresión: vigas reconstruidas con la misma configuración
+    (la UI recrea la viga en cada recarga) reutilizan la función compilada.
+    """
+    constante = _funcion_constante(expr)
+    if constante is not None:
+        return constante
+    global _AVISO_KERNELS_EMITIDO
+    if _NUMBA_DISPONIBLE:
+        try:
+            return _compilar_ufunc(expr)
+        except Exception as e:
+            if not _AVISO_KERNELS_EMITIDO:
+                _AVISO_KERNELS_EMITIDO = True
+                warnings.warn(
+                    f"No se pudo compilar con numba ({e}); se usa lambdify de NumPy",
+                    RuntimeWarning,
+                    stacklevel=2,
+                )
+    return sp.lambdify(x, expr, "numpy", cse=True)
+
+
+# Directorio de módulos generados: numba sólo guarda en disco (cache=True)
+# funciones definidas en un archivo .py real, no las creadas con exec. Es
+# privado del usuario (~/.cache, modo 0o700): los módulos se importan y
+# numba carga su caché desde ahí, así que nadie más debe poder escribir en él
+_DIR_KERNELS = os.path.join(
+    os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache"),
+    "analisis_viga",
+    "kernels",
+)
+# Módulos conservados en disco; al superarse se borran los más antiguos
+_MAX_KERNELS_DISCO = 256
+# El paso a lambdify de NumPy (numba falla o la caché no es privada) se avisa una sola vez
+_AVISO_KERNELS_EMITIDO = False
+
+
+def _verificar_privado(ruta: str, es_directorio: bool) -> None:
+    """Comprueba que ``ruta`` sea del usuario actual y que nadie más pueda escribirla.
+
+    En Windows ``st_mode`` siempre indica escritura para grupo y otros y no
+    hay ``getuid``: allí sólo se comprueba el tipo (el perfil del usuario ya
+    está protegido por sus ACL).
+
+    Raises
+    ------
+    PermissionError
+        Si es un enlace simbólico, no es del tipo esperado, pertenece a otro
+        usuario o tiene permiso de escritura para el grupo u otros.
+    """
+    info = os.lstat(ruta)
+    tipo_ok = stat.S_ISDIR(info.st_mode) if es_directorio else stat.S_ISREG(info.st_mode)
+    if not tipo_ok:
+        raise PermissionError(f"{ruta} no es un {'directorio' if es_directorio else 'archivo'} normal")
+    if os.name == "nt":
+        return
+    if info.st_uid != os.getuid():
+        raise PermissionError(f"{ruta} pertenece a otro usuario")
+    if info.st_mode & (stat.S_IWGRP | stat.S_IWOTH):
+        raise PermissionError(f"{ruta} es escribible por el grupo u otros")
+
+
+def _preparar_dir_kernels() -> None:
+    """Crea ``analisis_viga/kernels`` con modo 0o700 en cada nivel y lo verifica.
+
+    ``os.makedirs(mode=...)`` sólo aplica el modo al último nivel (los
+    intermedios quedan con ``0o777 & ~umask``, p. ej. 0o775): cada nivel
+    propio se crea uno a uno y, si ya existía y es del usuario, se restringe.
+    """
+    base = os.path.dirname(_DIR_KERNELS)
+    os.makedirs(os.path.dirname(base), exist_ok=True)
+    for directorio in (base, _DIR_KERNELS):
+        try:
+            os.mkdir(directorio, 0o700)
+        except FileExistsError:
+            pass
+        if os.name != "nt":
+            info = os.lstat(directorio)
+            if (
+                stat.S_ISDIR(info.st_mode)
+                and info.st_uid == os.getuid()
+                and stat.S_IMODE(info.st_mode) != 0o700
+            ):
+                os.chmod(directorio, 0o700)
+        _verificar_privado(directorio, es_directorio=True)
+
+
+def _podar_kernels() -> None:
+    """Borra los módulos más antiguos (y su caché de numba) si hay más de ``_MAX_KERNELS_DISCO``."""
+    with os.scandir(_DIR_KERNELS) as entradas:
+        modulos = [e for e in entradas if e.name.startswith("kernel_") and e.name.endswith(".py")]
+    if len(modulos) <= _MAX_KERNELS_DISCO:
+        return
+    modulos.sort(key=lambda e: e.stat().st_mtime)
+    sobrantes = modulos[: len(modulos) - _MAX_KERNELS_DISCO]
+    prefijos = tuple(e.name[:-3] + "." for e in sobrantes)
+    dir_cache = os.path.join(_DIR_KERNELS, "__pycache__")
+    archivos = [e.path for e in sobrantes]
+    if os.path.isdir(dir_cache):
+        with os.scandir(dir_cache) as entradas:
+            archivos.extend(e.path for e in entradas if e.name.startswith(prefijos))
+    for ruta in archivos:
+        try:
+            os.remove(ruta)
+        except OSError:
+            pass  # otro proceso ya lo borró
+
+
+def _compilar_ufunc(expr: sp.Expr) -> Callable:
+    """Compila ``expr`` como ufunc escalar de numba con caché en disco.
+
+    El código de lambdify se escribe en un módulo nombrado por el hash de
+    ``srepr(expr)`` y la versión de SymPy. La misma expresión en otra sesión
+    reutiliza ese archivo (sin generar código de nuevo) y la compilación que
+    numba guardó junto a él; un cambio de versión de SymPy genera otra clave.
+    Antes de importarlo se comprueba que el directorio y el archivo sean
+    privados del usuario (``_verificar_privado``).
+    """
+    firma = f"{sp.__version__}|{sp.srepr(expr)}"
+    clave = hashlib.sha1(firma.encode("utf-8")).hexdigest()[:20]
+    ruta = os.path.join(_DIR_KERNELS, f"kernel_{clave}.py")
+    _preparar_dir_kernels()
+    if not os.path.exists(ruta):
+        escalar = sp.lambdify(x, expr.rewrite(sp.Piecewise), "math")
+        fuente = inspect.getsource(escalar)
+        temporal = f"{ruta}.{os.getpid()}.tmp"
+        descriptor = os.open(temporal, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        with os.fdopen(descriptor, "w", encoding="utf-8") as fh:
+            fh.write("from math import *  # noqa: F401,F403\n\n\n" + fuente)
+        os.replace(temporal, ruta)  # atómico: otro proceso nunca ve el archivo a medias
+        _podar_kernels()
+    _verificar_privado(ruta, es_directorio=False)
+    nombre = f"_kernel_viga_{clave}"
+    modulo = sys.modules.get(nombre)
+    if modulo is None:
+        spec = importlib.util.spec_from_file_location(nombre, ruta)
+        modulo = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(modulo)
+        # Registrado para que numba pueda reimportarlo al leer su caché
+        sys.modules[nombre] = modulo
+    return numba.vectorize(
+        [numba.float64(numba.float64)], cache=True, fastmath=True
+    )(modulo._lambdifygenerated)
+
+
+@lru_cache(maxsize=256)
+def _lambdify_numpy(expr: sp.Expr) -> Callable:
+    """lambdify(x, expr, "numpy", cse=True) memorizado por expresión (inmutable y hashable)."""
+    constante = _funcion_constante(expr)
+    if constante is not None:
+        return constante
+    return sp.lambdify(x, expr, "numpy", cse=True)
+
+
+@lru_cache(maxsize=256)
+def _integrar_x(expr: sp.Expr) -> sp.Expr:
+    """∫ expr dx memorizado por expresión (integrate no guarda caché propia).
+
+    Los integrandos de la viga son sumas de polinomios, escalones de
+    Heaviside por polinomios y Piecewise de polinomios: sus primitivas se
+    escriben directamente (``_primitiva_x``) y sólo lo demás pasa por
+    ``sp.integrate``, que busca en sus tablas de patrones en cada llamada.
+    """
+    return _primitiva_x(expr)
+
+
+def _primitiva_x(expr: sp.Expr) -> sp.Expr:
+    """Primitiva en x término a término (sin constante), ``sp.integrate`` si no se reconoce."""
+    if not expr.has(x):
+        return expr * x
+    if expr.is_Add:
+        return sp.Add(*(_primitiva_x(termino) for termino in expr.args))
+    coef, resto = expr.as_independent(x, as_Add=False)
+    if coef != 1:
+        return coef * _primitiva_x(resto)
+    if resto.is_polynomial(x):
+        return sp.Poly(resto, x).integrate().as_expr()
+    if isinstance(resto, sp.Piecewise):
+        return _primitiva_tramos(resto)
+
+    # c·P(x)·H(x - a)  →  Q(x - a)·H(x - a), con Q' = P y Q(0) = 0 (continua en a)
+    factores = resto.args if resto.is_Mul else (resto,)
+    escalones = [f for f in factores if isinstance(f, sp.Heaviside)]
+    if len(escalones) == 1:
+        escalon = escalones[0]
+        argumento = escalon.args[0]
+        polinomio = sp.Mul(*(f for f in factores if f is not escalon))
+        if (
+            argumento.is_polynomial(x)
+            and sp.degree(argumento, x) == 1
+            and argumento.coeff(x, 1) == 1
+            and polinomio.is_polynomial(x)
+        ):
+            a = -argumento.subs(x, 0)
+            u = sp.Dummy("u")
+            primitiva = sp.Poly(polinomio.subs(x, u + a), u).integrate().as_expr()
+            return primitiva.subs(u, argumento) * escalon
+    return sp.integrate(expr, x)
+
+
+def _primitiva_tramos(expr: sp.Piecewise) -> sp.Expr:
+    """Primitiva continua de un Piecewise de polinomios con condiciones ``x < p`` crecientes.
+
+    Cada tramo se integra como polinomio y se desplaza para empalmar con el
+    anterior en su límite; los tramos ``Eq(x, p)`` (medida nula) se omiten,
+    igual que hace ``sp.integrate``.
+    """
+    tramos = []
+    anterior = None
+    limite = None
+    for valor, condicion in expr.args:
+        if isinstance(condicion, sp.Eq):
+            continue
+        es_limite = (
+            isinstance(condicion, sp.StrictLessThan)
+            and condicion.lhs == x
+            and condicion.rhs.is_number
         )
+        if not (es_limite or condicion == sp.true) or not valor.is_polynomial(x):
+            return sp.integrate(expr, x)
+        primitiva = sp.Poly(valor, x).integrate()
+        if anterior is not None:
+            primitiva = primitiva + (anterior.eval(limite) - primitiva.eval(limite))
+        tramos.append((primitiva.as_expr(), condicion))
+        anterior = primitiva
+        limite = condicion.rhs if es_limite else None
+    return sp.Piecewise(*tramos)
+
+
+def _evaluar_en_malla(func: Callable, x_vals: np.ndarray) -> np.ndarray:
+    """``func(x_vals)`` como arreglo float con la forma de la malla.
+
+    lambdify devuelve un escalar para expresiones constantes (p. ej. V=0 sin
+    cargas); sólo en ese caso se materializa el arreglo completo.
+    """
+    return _como_malla(func(x_vals), x_vals)
+
+
+def _como_malla(valores: Any, x_vals: np.ndarray) -> np.ndarray:
+    """``valores`` como arreglo float con la forma de ``x_vals`` (copia sólo si es escalar)."""
+    valores = np.asarray(valores, dtype=float)
+    if valores.shape != x_vals.shape:
+        valores = np.broadcast_to(valores, x_vals.shape).copy()
+    return valores
+
+
+# Series que devuelven ``evaluar`` y ``_evaluar_numerico``, en este orden
+_CAMPOS_EVALUACION = ("x", "V", "M", "theta", "deflexion")
+
+
+def _empaquetar_resultados(*series: np.ndarray) -> Dict[str, np.ndarray]:
+    """Las series de ``_CAMPOS_EVALUACION`` como filas de un único bloque (5, n).
+
+    Una sola reserva contigua por evaluación (cada serie sigue siendo un
+    arreglo contiguo); ``_bloque_resultados`` lo recupera para construir un
+    DataFrame o una matriz (n, 5) sin copiar.
+    """
+    bloque = np.empty((len(_CAMPOS_EVALUACION), np.size(series[0])), dtype=float)
+    for fila, serie in zip(bloque, series):
+        fila[...] = serie
+    return dict(zip(_CAMPOS_EVALUACION, bloque))
+
+
+def _bloque_resultados(datos: Dict[str, np.ndarray]) -> Optional[np.ndarray]:
+    """Bloque (5, n) compartido por las series de ``_empaquetar_resultados`` (None si no lo hay)."""
+    bloque = getattr(datos.get("x"), "base", None)
+    if not isinstance(bloque, np.ndarray) or bloque.shape != (len(_CAMPOS_EVALUACION), datos["x"].size):
+        return None
+    if any(datos.get(campo) is None or datos[campo].base is not bloque for campo in _CAMPOS_EVALUACION):
+        return None
+    return bloque
+
+
+def _indices_cercanos(x_malla: np.ndarray, posiciones: np.ndarray) -> np.ndarray:
+    """Índice del nodo más cercano a cada posición en una malla creciente (O(log N))."""
+    idx = np.searchsorted(x_malla, posiciones)
+    idx = np.clip(idx, 1, len(x_malla) - 1)
+    izq = x_malla[idx - 1]
+    der = x_malla[idx]
+    return np.where(np.abs(posiciones - izq) <= np.abs(der - posiciones), idx - 1, idx)
+
+
+if _NUMBA_DISPONIBLE:
+
+    @numba.njit(parallel=True, cache=True)
+    def _kernel_escalones_macaulay(x_vals, coef, offset, exponente):  # pragma: no cover - requiere numba
+        # Un nodo por iteración (prange) y todos los términos en registros:
+        # sin el arreglo n_x × n_terminos de la versión NumPy
+        out = np.empty(x_vals.shape[0])
+        for i in numba.prange(x_vals.shape[0]):
+            acum = 0.0
+            for k in range(coef.shape[0]):
+                dif = x_vals[i] - offset[k]
+                if dif >= 0.0:
+                    termino = coef[k]
+                    for _ in range(int(exponente[k])):
+                        termino *= dif
+                    acum += termino
+            out[i] = acum
+        return out
+
+    @numba.njit(cache=True)
+    def _kernel_pendiente_deflexion(M_vals, x_vals, EI):  # pragma: no cover - requiere numba
+        n = M_vals.shape[0]
+        theta = np.zeros(n)
+        y = np.zeros(n)
+        curv_ant = M_vals[0] / EI
+        for j in range(n - 1):
+            dx = x_vals[j + 1] - x_vals[j]
+            curv = M_vals[j + 1] / EI
+            theta[j + 1] = theta[j] + 0.5 * dx * (curv_ant + curv)
+            y[j + 1] = y[j] + 0.5 * dx * (theta[j] + theta[j + 1])
+            curv_ant = curv
+        return theta, y
+
+
+@lru_cache(maxsize=32)
+def _malla_uniforme(longitud: float, num_puntos: int) -> Tuple[np.ndarray, float]:
+    """``np.linspace(0, L, n, retstep=True)`` memorizada y de sólo lectura."""
+    x_vals, dx = np.linspace(0.0, longitud, num_puntos, retstep=True)
+    x_vals.setflags(write=False)
+    return x_vals, float(dx)
+
+
+def _cumtrapz_uniforme(y: np.ndarray, dx: float) -> np.ndarray:
+    """Trapecios acumulados sobre una malla de paso constante ``dx`` (inicial 0)."""
+    out = np.empty_like(y, dtype=float)
+    if out.size == 0:
+        return out
+    out[0] = 0.0
+    np.cumsum(0.5 * dx * (y[:-1] + y[1:]), out=out[1:])
+    return out
+
+
+def _cumsimpson(
+    y: np.ndarray, x_vals: np.ndarray, dx: Optional[float], saltos: np.ndarray
+) -> np.ndarray:
+    """Simpson acumulado (inicial 0) con trapecios en los intervalos junto a un salto de ``y``.
+
+    ``cumulative_simpson`` ajusta una parábola por cada tres nodos; si ``y``
+    salta entre ellos (pares puntuales en M) el error deja de ser O(h⁴) y
+    supera al de los trapecios, así que esos pocos incrementos se sustituyen.
+    """
+    malla = {"dx": dx} if dx is not None else {"x": x_vals}
+    incrementos = np.diff(cumulative_simpson(y, initial=0.0, **malla))
+    if saltos.size:
+        paso = dx if dx is not None else np.diff(x_vals)
+        trapecios = 0.5 * paso * (y[:-1] + y[1:])
+        i_salto = np.searchsorted(x_vals, saltos)
+        cerca = (i_salto[:, None] + np.arange(-2, 2)[None, :]).ravel()
+        cerca = np.unique(cerca[(cerca >= 0) & (cerca < incrementos.size)])
+        incrementos[cerca] = trapecios[cerca]
+    out = np.empty_like(y)
+    out[0] = 0.0
+    np.cumsum(incrementos, out=out[1:])
+    return out
+
+
+def integrar_pendiente_deflexion(
+    M_vals: np.ndarray,
+    x_vals: np.ndarray,
+    EI: float,
+    dx: Optional[float] = None,
+    saltos: Optional[Any] = None,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """θ(x) = ∫₀ˣ M/EI y y(x) = ∫₀ˣ θ por Simpson (o trapecios) acumulados.
+
+    Con SciPy ≥ 1.12 y al menos 3 nodos se usa ``cumulative_simpson``
+    (error O(h⁴) frente a O(h²), así que basta una malla más gruesa para la
+    misma precisión); ``saltos`` son las posiciones de los pares puntuales,
+    donde M es discontinuo y θ se integra por trapecios. Si no está
+    disponible se integra por trapecios: con numba en un único recorrido de
+    la malla, con ``_cumtrapz_uniforme`` si se indica el paso ``dx`` de una
+    malla uniforme, o con ``cumulative_trapezoid``.
+    """
+    M_vals = np.ascontiguousarray(M_vals, dtype=float)
+    x_vals = np.ascontiguousarray(x_vals, dtype=float)
+    if cumulative_simpson is not None and M_vals.size >= 3:
+        saltos = np.asarray(list(saltos) if saltos is not None else [], dtype=float)
+        theta_vals = _cumsimpson(M_vals / EI, x_vals, dx, saltos)
+        return theta_vals, _cumsimpson(theta_vals, x_vals, dx, np.empty(0))
+    if _NUMBA_DISPONIBLE and M_vals.size > 1:
+        return _kernel_pendiente_deflexion(M_vals, x_vals, float(EI))
+    if dx is not None:
+        theta_vals = _cumtrapz_uniforme(M_vals / EI, dx)
+        return theta_vals, _cumtrapz_uniforme(theta_vals, dx)
+    from scipy.integrate import cumulative_trapezoid
+
+    theta_vals = cumulative_trapezoid(M_vals / EI, x_vals, initial=0.0)
+    y_vals = cumulative_trapezoid(theta_vals, x_vals, initial=0.0)
+    return theta_vals, y_vals
+
+
+def integrar_momento(
+    V_vals: np.ndarray,
+    x_vals: np.ndarray,
+    saltos_M: Dict[float, float],
+    tol: float,
+    dx: Optional[float] = None,
+) -> np.ndarray:
+    """M(x) = ∫₀ˣ V dξ + Σ M0·H(x-a) (H(0)=1/2) sobre una malla creciente.
+
+    Los incrementos por trapecios y los saltos M0 (depositados en el primer
+    nodo con x > a + tol) se acumulan en un único ``cumsum``; el medio salto
+    M0/2 va al nodo más cercano a ``a`` si dista menos de ``tol``. Con ``dx``
+    se asume malla uniforme.
+    """
+    V_vals = np.asarray(V_vals, dtype=float)
+    x_vals = np.asarray(x_vals, dtype=float)
+    incrementos = np.zeros_like(V_vals)
+    if V_vals.size > 1:
+        paso = dx if dx is not None else np.diff(x_vals)
+        incrementos[1:] = 0.5 * paso * (V_vals[:-1] + V_vals[1:])
+    if not saltos_M:
+        return np.cumsum(incrementos)
+
+    pos = np.fromiter(saltos_M.keys(), dtype=float, count=len(saltos_M))
+    mag = np.fromiter(saltos_M.values(), dtype=float, count=len(saltos_M))
+    i_despues = np.searchsorted(x_vals, pos + tol, side="right")
+    en_malla = i_despues < incrementos.size
+    np.add.at(incrementos, i_despues[en_malla], mag[en_malla])
+    M_vals = np.cumsum(incrementos)
+
+    i_exacto = np.searchsorted(x_vals, pos - tol, side="right")
+    i_fin_exacto = np.searchsorted(x_vals, pos + tol, side="left")
+    en_nodo = i_fin_exacto > i_exacto
+    if np.any(en_nodo):
+        if x_vals.size > 1:
+            idx = np.clip(_indices_cercanos(x_vals, pos), i_exacto, i_fin_exacto - 1)
+        else:
+            idx = np.zeros(pos.size, dtype=int)
+        np.add.at(M_vals, idx[en_nodo], 0.5 * mag[en_nodo])
+    return M_vals
+
+
+def _matriz_deflexion_unitaria(
+    x_eval: np.ndarray, x_carga: np.ndarray, x_a: float, x_b: float, EI: float
+) -> np.ndarray:
+    """Deflexiones por una fuerza unitaria hacia arriba (P = -1) en una viga biapoyada.
+
+    Devuelve la matriz f[i, j] = y(x_eval[i]) debida a la fuerza en x_carga[j],
+    con apoyos en x_a y x_b, construida de una sola vez por *broadcasting*.
+    """
+    xe = np.asarray(x_eval, dtype=float)[:, None]
+    a = np.asarray(x_carga, dtype=float)[None, :]
+    P = -1.0
+    d = x_b - x_a
+    R_b = P * (a - x_a) / d
+    R_a = P - R_b
+
+    def ei_y(xv: np.ndarray) -> np.ndarray:
+        return (
+            R_a * macaulay_np(xv, x_a, 3)
+            + R_b * macaulay_np(xv, x_b, 3)
+            - P * np.maximum(xv - a, 0.0) ** 3
+        ) / 6.0
+
+    f_a = ei_y(np.full((1, 1), x_a))
+    f_b = ei_y(np.full((1, 1), x_b))
+    C1 = -(f_b - f_a) / d
+    C2 = -f_a - C1 * x_a
+    return (ei_y(xe) + C1 * xe + C2) / EI
+
+
+def _terminos_macaulay_apoyos(
+    pos_apoyos: np.ndarray, reacciones: np.ndarray, cargas: List["Carga"]
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, float, float]:
+    """Términos (coef, a, n) de EI·y y constantes C1, C2 para apoyos y reacciones dados.
+
+    EI·y(x) = Σ R<x-s>³/6 + Σ F_carga(x) + C1·x + C2, con C1 y C2 fijados por
+    y = 0 en el primer y el último apoyo. Un par sobre uno de estos apoyos
+    con ``en_vano=False`` no entra al vano (igual que en M(x)).
+
+    Raises
+    ------
+    NotImplementedError
+        Si alguna carga no define ``deflection_terms``.
+    """
+    terminos = [(R / 6.0, s, 3) for R, s in zip(reacciones, pos_apoyos)]
+    for c in cargas:
+        if (
+            isinstance(c, CargaMomento)
+            and not c.en_vano
+            and np.min(np.abs(pos_apoyos - c.posicion)) < 1e-12
+        ):
+            continue
+        terminos.extend(c.deflection_terms())
+    coef, offset, exponente = (np.array(col, dtype=float) for col in zip(*terminos))
+
+    x_a, x_b = float(pos_apoyos[0]), float(pos_apoyos[-1])
+    f_a, f_b = _sumar_macaulay(np.array([x_a, x_b]), coef, offset, exponente)
+    C1 = -(f_b - f_a) / (x_b - x_a)
+    C2 = -f_a - C1 * x_a
+    return coef, offset, exponente, float(C1), float(C2)
+
+
+def _deflexion_macaulay_apoyos(
+    x_eval: np.ndarray,
+    pos_apoyos: np.ndarray,
+    reacciones: np.ndarray,
+    cargas: List["Carga"],
+    EI: float,
+) -> np.ndarray:
+    """y(x) por Macaulay para apoyos y reacciones dados, sin construir una ``Viga``.
+
+    Ver ``_terminos_macaulay_apoyos`` para los términos y las constantes.
+
+    Raises
+    ------
+    NotImplementedError
+        Si alguna carga no define ``deflection_terms``.
+    """
+    x_eval = np.asarray(x_eval, dtype=float)
+    coef, offset, exponente, C1, C2 = _terminos_macaulay_apoyos(pos_apoyos, reacciones, cargas)
+    return (_sumar_macaulay(x_eval, coef, offset, exponente) + C1 * x_eval + C2) / EI
+
+
+def _campos_macaulay_apoyos(
+    x_eval: np.ndarray,
+    pos_apoyos: np.ndarray,
+    reacciones: np.ndarray,
+    cargas: List["Carga"],
+    EI: float,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """V, M, θ y y exactos en ``x_eval`` derivando los términos de Macaulay de EI·y.
+
+    V(x) y M(x) son polinomios por tramos: sus valores salen de las derivadas
+    tercera y segunda de los mismos términos, sin integrar numéricamente.
+    Los escalones (<x-a>⁰) usan H(0)=1.
+
+    Raises
+    ------
+    NotImplementedError
+        Si alguna carga no define ``deflection_terms``.
+    """
+    x_eval = np.asarray(x_eval, dtype=float)
+    coef, offset, exponente, C1, C2 = _terminos_macaulay_apoyos(pos_apoyos, reacciones, cargas)
+    V = _sumar_escalones_macaulay(x_eval, *_derivar_macaulay(coef, offset, exponente, orden=3))
+    M = _sumar_escalones_macaulay(x_eval, *_derivar_macaulay(coef, offset, exponente, orden=2))
+    theta = (
+        _sumar_escalones_macaulay(x_eval, *_derivar_macaulay(coef, offset, exponente, orden=1)) + C1
+    ) / EI
+    y = (_sumar_macaulay(x_eval, coef, offset, exponente) + C1 * x_eval + C2) / EI
+    return V, M, theta, y
 
 
 # ============================================================
 # CLASE BASE: CARGA
 # ============================================================
 
-@dataclass
+@dataclass(slots=True)
 class Carga:
     """
     Clase base para todos los tipos de carga.
@@ -163,6 +830,7 @@ class Carga:
       - moment_about(): Momento respecto a un punto
       - shear_expression(): Contribución al cortante V(x)
       - load_intensity(): Intensidad q(x) para cargas distribuidas
+      - deflection_terms(): Términos de Macaulay de EI·y(x) (opcional)
     """
 
     def total_load(self) -> float:
@@ -177,12 +845,20 @@ class Carga:
         """Retorna la expresión matemática de cómo afecta al cortante V(x)."""
         raise NotImplementedError
 
+    def deflection_terms(self) -> List[Tuple[float, float, int]]:
+        """Términos (coef, a, n) de su contribución a EI·y(x) = Σ coef·<x-a>^n."""
+        raise NotImplementedError
+
+    def _signature(self) -> Tuple[Any, ...]:
+        """Tupla inmutable (tipo, campos) usada como clave de caché."""
+        return (type(self).__name__,) + tuple(getattr(self, f.name) for f in fields(self))
+
     def load_intensity(self, variable: sp.Symbol = x) -> sp.Expr:
         """
         Retorna la intensidad de carga q(x).
         Para cargas puntuales retorna 0 (no tienen distribución continua).
         """
-        return sp.Integer(0)
+        return sp.S.Zero
 
     def descripcion(self) -> str:
         """Texto descriptivo de la carga para mostrar al usuario."""
@@ -193,7 +869,7 @@ class Carga:
 # CARGA PUNTUAL: Fuerza concentrada en un punto
 # ============================================================
 
-@dataclass
+@dataclass(slots=True)
 class CargaPuntual(Carga):
     """
     Carga puntual: Fuerza P aplicada en posición x=a
@@ -237,6 +913,10 @@ class CargaPuntual(Carga):
         """
         return -self.magnitud * sp.Heaviside(variable - self.posicion, 1)
 
+    def deflection_terms(self) -> List[Tuple[float, float, int]]:
+        """M = -P<x-a>  →  EI·y = -P<x-a>³/6"""
+        return [(-self.magnitud / 6.0, self.posicion, 3)]
+
     def descripcion(self) -> str:
         return f"Carga puntual P={self.magnitud:.3g} N en x={self.posicion:.3g} m"
 
@@ -245,7 +925,7 @@ class CargaPuntual(Carga):
 # MOMENTO PUNTUAL: Par concentrado
 # ============================================================
 
-@dataclass
+@dataclass(slots=True)
 class CargaMomento(Carga):
     """
     Momento concentrado (par) aplicado en x=a
@@ -294,12 +974,16 @@ class CargaMomento(Carga):
 
     def shear_expression(self, variable: sp.Symbol = x) -> sp.Expr:
         """Un momento concentrado no altera V(x)."""
-        return sp.Integer(0)
+        return sp.S.Zero
+
+    def deflection_terms(self) -> List[Tuple[float, float, int]]:
+        """M = M0<x-a>⁰  →  EI·y = M0<x-a>²/2"""
+        return [(self.magnitud / 2.0, self.posicion, 2)]
 
     def descripcion(self) -> str:
         return f"Momento puntual M={self.magnitud:.3g} N·m en x={self.posicion:.3g} m"
 
-@dataclass
+@dataclass(slots=True)
 class CargaUniforme(Carga):
     intensidad: float
     inicio: float
@@ -326,11 +1010,15 @@ class CargaUniforme(Carga):
         return float(self.total_load() * distancia)
 
     def shear_expression(self, variable: sp.Symbol = x) -> sp.Expr:
-        return (
-            -self.intensidad * macaulay(variable, self.inicio, 1)
-            + self.intensidad * macaulay(variable, self.fin, 1)
+        return _cortante_uniforme(
+            variable, float(self.intensidad), float(self.inicio), float(self.fin)
         )
 
+    def deflection_terms(self) -> List[Tuple[float, float, int]]:
+        """M = -w/2(<x-a>² - <x-b>²)  →  EI·y = -w/24(<x-a>⁴ - <x-b>⁴)"""
+        w = self.intensidad
+        return [(-w / 24.0, self.inicio, 4), (w / 24.0, self.fin, 4)]
+
     def load_intensity(self, variable: sp.Symbol = x) -> sp.Expr:
         return self.intensidad * (heaviside(variable - self.inicio) - heaviside(variable - self.fin))
 
@@ -340,7 +1028,7 @@ class CargaUniforme(Carga):
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class CargaTrapezoidal(Carga):
     intensidad_inicio: float
     intensidad_fin: float
@@ -382,31 +1070,39 @@ class CargaTrapezoidal(Carga):
         return float(self.total_load() * distancia)
 
     def shear_expression(self, variable: sp.Symbol = x) -> sp.Expr:
+        return _cortante_trapezoidal(
+            variable,
+            float(self.intensidad_inicio),
+            float(self.intensidad_fin),
+            float(self.inicio),
+            float(self.fin),
+        )
+
+    def deflection_terms(self) -> List[Tuple[float, float, int]]:
+        """Cuarta integral de -q(x) con q = w1<x-a>⁰ + k<x-a>¹ - w2<x-b>⁰ - k<x-b>¹."""
         w1, w2 = self.intensidad_inicio, self.intensidad_fin
         a, b = self.inicio, self.fin
-        k = (w2 - w1) / (b - a)
-        expr = -(
-            w1 * macaulay(variable, a, 1)
-            + k / 2 * macaulay(variable, a, 2)
-        )
-        expr += (
-            w1 * macaulay(variable, b, 1)
-            + k / 2 * macaulay(variable, b, 2)
-        )
-        return sp.simplify(expr)
+        k = self.pendiente
+        return [
+            (-w1 / 24.0, a, 4),
+            (-k / 120.0, a, 5),
+            (w2 / 24.0, b, 4),
+            (k / 120.0, b, 5),
+        ]
 
     def load_intensity(self, variable: sp.Symbol = x) -> sp.Expr:
+        """Recta w1 → w2 acotada con escalones (sin Piecewise).
+
+        H(x-a) con H(0)=1 y H(x-b) con H(0)=0 conservan el intervalo cerrado
+        [a, b]: q(a) = w1 y q(b) = w2.
+        """
         w1, w2 = self.intensidad_inicio, self.intensidad_fin
         a, b = self.inicio, self.fin
         if b == a:
-            return sp.Integer(0)
+            return sp.S.Zero
         pendiente = (w2 - w1) / (b - a)
         segmento = w1 + pendiente * (variable - a)
-        return sp.Piecewise(
-            (0, variable < a),
-            (segmento, sp.And(variable >= a, variable <= b)),
-            (0, True),
-        )
+        return segmento * (sp.Heaviside(variable - a, 1) - heaviside(variable - b))
 
     def descripcion(self) -> str:
         return (
@@ -419,10 +1115,11 @@ class CargaTrapezoidal(Carga):
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class CargaTriangular(CargaTrapezoidal):
     def __post_init__(self) -> None:
-        super().__post_init__()
+        # slots=True recrea la clase: super() sin argumentos no es válido aquí
+        CargaTrapezoidal.__post_init__(self)
         if not (self.intensidad_inicio == 0.0 or self.intensidad_fin == 0.0):
             raise ValueError(
                 "La carga triangular requiere que una de las intensidades sea cero;"
@@ -437,7 +1134,18 @@ class CargaTriangular(CargaTrapezoidal):
         )
 
 
-@dataclass
+# Límite que cada tipo de carga no puede superar (atributo, mensaje de error):
+# agregar_carga valida con una sola búsqueda por tipo en lugar de isinstance
+_LIMITE_CARGA: Dict[type, Tuple[str, str]] = {
+    CargaPuntual: ("posicion", "La carga puntual en x={} está fuera de la viga (L={})"),
+    CargaMomento: ("posicion", "El momento puntual en x={} está fuera de la viga (L={})"),
+    CargaUniforme: ("fin", "La carga distribuida termina en x={}, fuera de la viga (L={})"),
+    CargaTrapezoidal: ("fin", "La carga distribuida termina en x={}, fuera de la viga (L={})"),
+    CargaTriangular: ("fin", "La carga distribuida termina en x={}, fuera de la viga (L={})"),
+}
+
+
+@dataclass(slots=True)
 class Apoyo:
     """Representa un apoyo simple en una posición específica de la viga.
     
@@ -491,6 +1199,33 @@ class Viga:
     _reacciones: Optional[Dict[str, float]] = field(default=None, init=False, repr=False)
     _expresiones: Optional[Dict[str, sp.Expr]] = field(default=None, init=False, repr=False)
     _lambdas: Optional[Dict[str, Callable]] = field(default=None, init=False, repr=False)
+    _load_cache: Optional[Tuple[np.ndarray, np.ndarray]] = field(default=None, init=False, repr=False)
+    _apoyo_pos: np.ndarray = field(default_factory=lambda: np.empty(0), init=False, repr=False)
+    _apoyo_names: Tuple[str, ...] = field(default=(), init=False, repr=False)
+    _cfg_key: Optional[Tuple[Any, ...]] = field(default=None, init=False, repr=False)
+    _cargas_momento: Optional[List[CargaMomento]] = field(default=None, init=False, repr=False)
+    _sumas_cargas: Optional[Tuple[float, float]] = field(default=None, init=False, repr=False)
+    _reacciones_arr: Optional[Tuple[Dict[str, float], np.ndarray]] = field(default=None, init=False, repr=False)
+
+    # V(x) compartida entre vigas con mismas cargas, apoyos y reacciones (LRU acotada)
+    _shear_cache: ClassVar["OrderedDict[Tuple[Any, ...], sp.Expr]"] = OrderedDict()
+    _SHEAR_CACHE_MAX: ClassVar[int] = 64
+
+    # {V, M, θ, y} por firma completa (L, E, I, apoyos, cargas en cualquier
+    # orden): vigas idénticas (barridos de parámetros, recargas de la UI)
+    # no repiten la construcción
+    _expresiones_cache: ClassVar["OrderedDict[Tuple[Any, ...], Dict[str, sp.Expr]]"] = OrderedDict()
+    _EXPRESIONES_CACHE_MAX: ClassVar[int] = 64
+
+    # Reacciones hiperestáticas por firma (L, apoyos, cargas), compartidas
+    # entre instancias del proceso (la UI reconstruye la viga en cada recarga)
+    _reacciones_cache: ClassVar["OrderedDict[Tuple[Any, ...], Dict[str, float]]"] = OrderedDict()
+    _REACCIONES_CACHE_MAX: ClassVar[int] = 256
+
+    # La caché global de SymPy (cacheit) crece con cada geometría distinta; en
+    # procesos de larga vida (UI) se vacía cada N construcciones simbólicas
+    _construcciones: ClassVar[int] = 0
+    _LIMPIAR_CACHE_SYMPY_CADA: ClassVar[int] = 100
 
     def __post_init__(self) -> None:
         if self.longitud <= 0:
@@ -514,17 +1249,34 @@ class Viga:
                         f"El apoyo '{apoyo.nombre}' en x={apoyo.posicion} está fuera de la viga (L={self.longitud})"
                     )
             
-            # Validar duplicados en apoyos iniciales
-            for i, apoyo in enumerate(self.apoyos):
-                for otro in self.apoyos[i+1:]:
-                    if abs(apoyo.posicion - otro.posicion) < 1e-3:
-                        raise ValueError(
-                            f"Los apoyos '{apoyo.nombre}' y '{otro.nombre}' están muy cercanos "
-                            f"(distancia={abs(apoyo.posicion - otro.posicion)*1000:.3f} mm, mínimo=1.0 mm)"
-                        )
-            
             # Ordenar apoyos por posición
             self.apoyos.sort(key=lambda a: a.posicion)
+            self._actualizar_arrays_apoyos()
+
+            # Validar duplicados en apoyos iniciales: ya ordenados, el par más
+            # cercano siempre es contiguo, así que basta con np.diff
+            distancias = np.diff(self._apoyo_pos)
+            cercanos = np.flatnonzero(distancias < 1e-3)
+            if cercanos.size:
+                i = int(cercanos[0])
+                apoyo, otro = self.apoyos[i], self.apoyos[i + 1]
+                raise ValueError(
+                    f"Los apoyos '{apoyo.nombre}' y '{otro.nombre}' están muy cercanos "
+                    f"(distancia={distancias[i]*1000:.3f} mm, mínimo=1.0 mm)"
+                )
+        self._actualizar_arrays_apoyos()
+
+    def _actualizar_arrays_apoyos(self) -> None:
+        """Reconstruye posiciones y nombres de apoyos (ordenados) como arreglos."""
+        self._apoyo_pos = np.fromiter(
+            (a.posicion for a in self.apoyos), dtype=float, count=len(self.apoyos)
+        )
+        self._apoyo_names = tuple(a.nombre for a in self.apoyos)
+
+    def _en_apoyo(self, posicion: float, tol: float = 1e-12) -> bool:
+        """Indica si ``posicion`` coincide con algún apoyo (comparación vectorizada)."""
+        pos = self._apoyo_pos
+        return bool(pos.size) and bool(np.min(np.abs(pos - posicion)) < tol)
     
     def _validar_apoyo_duplicado(self, nueva_posicion: float, nuevo_nombre: str = "") -> None:
         """Verifica que no haya apoyos muy cercanos (< 1mm).
@@ -541,14 +1293,20 @@ class Viga:
         ValueError
             Si ya existe un apoyo muy cercano a la posición dada.
         """
-        for apoyo_existente in self.apoyos:
-            distancia_mm = abs(apoyo_existente.posicion - nueva_posicion) * 1000
-            if distancia_mm < 1.0:
-                nombre_info = f"'{nuevo_nombre}' " if nuevo_nombre else ""
-                raise ValueError(
-                    f"Ya existe el apoyo '{apoyo_existente.nombre}' muy cercano a la posición {nombre_info}"
-                    f"x={nueva_posicion:.6f} m (distancia={distancia_mm:.3f} mm, mínimo=1.0 mm)"
-                )
+        pos = self._apoyo_pos
+        if pos.size == 0:
+            return
+        # Posiciones ordenadas: el más cercano es el vecino izquierdo o derecho
+        idx = int(np.searchsorted(pos, nueva_posicion))
+        vecinos = [i for i in (idx - 1, idx) if 0 <= i < pos.size]
+        i_cercano = min(vecinos, key=lambda i: abs(pos[i] - nueva_posicion))
+        distancia_mm = abs(pos[i_cercano] - nueva_posicion) * 1000
+        if distancia_mm < 1.0:
+            nombre_info = f"'{nuevo_nombre}' " if nuevo_nombre else ""
+            raise ValueError(
+                f"Ya existe el apoyo '{self._apoyo_names[i_cercano]}' muy cercano a la posición {nombre_info}"
+                f"x={nueva_posicion:.6f} m (distancia={distancia_mm:.3f} mm, mínimo=1.0 mm)"
+            )
     
     def agregar_apoyo(self, apoyo: Apoyo) -> None:
         """Agrega un apoyo verificando que esté dentro del dominio de la viga.
@@ -563,8 +1321,11 @@ class Viga:
         # Verificar que no haya un apoyo muy cercano usando método unificado
         self._validar_apoyo_duplicado(apoyo.posicion, apoyo.nombre)
         
-        self.apoyos.append(apoyo)
-        self.apoyos.sort(key=lambda a: a.posicion)
+        # La lista ya está ordenada: inserción en su posición (búsqueda binaria
+        # sobre _apoyo_pos) en lugar de reordenar todo en cada alta
+        idx = int(np.searchsorted(self._apoyo_pos, apoyo.posicion, side="right"))
+        self.apoyos.insert(idx, apoyo)
+        self._actualizar_arrays_apoyos()
         
         # Invalidar cachés
         self._reacciones = None
@@ -574,6 +1335,7 @@ class Viga:
     def limpiar_apoyos(self) -> None:
         """Elimina todos los apoyos e invalida cachés."""
         self.apoyos.clear()
+        self._actualizar_arrays_apoyos()
         self._reacciones = None
         self._expresiones = None
         self._lambdas = None
@@ -583,27 +1345,29 @@ class Viga:
 
         Resetea las cachés de resultados para asegurar coherencia.
         """
-        if isinstance(carga, CargaPuntual):
-            if carga.posicion > self.longitud:
-                raise ValueError(
-                    f"La carga puntual en x={carga.posicion} está fuera de la viga (L={self.longitud})"
-                )
-        elif isinstance(carga, CargaMomento):
-            if carga.posicion > self.longitud:
-                raise ValueError(
-                    f"El momento puntual en x={carga.posicion} está fuera de la viga (L={self.longitud})"
-                )
-        elif hasattr(carga, "fin"):
-            if getattr(carga, "fin") > self.longitud:  # type: ignore[arg-type]
-                raise ValueError(
-                    f"La carga distribuida termina en x={getattr(carga,'fin')}, fuera de la viga (L={self.longitud})"
-                )
+        limite = _LIMITE_CARGA.get(type(carga))
+        if limite is None:
+            # Subclases externas: se valida con la entrada de su clase base conocida
+            limite = next(
+                (_LIMITE_CARGA[t] for t in type(carga).__mro__ if t in _LIMITE_CARGA), None
+            )
+        if limite is not None:
+            atributo, mensaje = limite
+            extremo = getattr(carga, atributo)
+            if extremo > self.longitud:
+                raise ValueError(mensaje.format(extremo, self.longitud))
 
         self.cargas.append(carga)
         # Invalidar cachés
         self._reacciones = None
         self._expresiones = None
         self._lambdas = None
+        self._load_cache = None
+        self._cargas_momento = None
+        # ΣP y ΣM(0) se actualizan en O(1) en lugar de recalcularse
+        if self._sumas_cargas is not None:
+            suma_P, suma_M0 = self._sumas_cargas
+            self._sumas_cargas = (suma_P + carga.total_load(), suma_M0 + carga.moment_about(0.0))
 
     def limpiar_cargas(self) -> None:
         """Elimina todas las cargas e invalida cachés."""
@@ -611,6 +1375,59 @@ class Viga:
         self._reacciones = None
         self._expresiones = None
         self._lambdas = None
+        self._load_cache = None
+        self._cargas_momento = None
+        self._sumas_cargas = (0.0, 0.0)
+
+    @property
+    def cargas_momento(self) -> List[CargaMomento]:
+        """Pares concentrados de ``cargas`` (filtrado una vez, invalidado al mutar)."""
+        if self._cargas_momento is None:
+            self._cargas_momento = [c for c in self.cargas if isinstance(c, CargaMomento)]
+        return self._cargas_momento
+
+    def _arrays_cargas(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Resultantes y momentos respecto a x=0 de cada carga (estructura de arreglos).
+
+        Como el brazo es lineal en el origen, M(o) = M(0) - P·o para todas
+        las cargas (el par tiene P=0), así que basta con guardar M(0).
+        """
+        if self._load_cache is None:
+            n = len(self.cargas)
+            totales = np.fromiter((c.total_load() for c in self.cargas), dtype=float, count=n)
+            momentos0 = np.fromiter((c.moment_about(0.0) for c in self.cargas), dtype=float, count=n)
+            self._load_cache = (totales, momentos0)
+        return self._load_cache
+
+    def _reacciones_array(self) -> np.ndarray:
+        """Reacciones en el orden de ``_apoyo_pos`` como arreglo.
+
+        Se reconstruye sólo cuando ``calcular_reacciones`` devuelve un
+        resultado nuevo (cualquier cambio de cargas o apoyos lo invalida).
+        """
+        reacciones = self.calcular_reacciones()
+        if self._reacciones_arr is None or self._reacciones_arr[0] is not reacciones:
+            R = np.fromiter(
+                (reacciones[nombre] for nombre in self._apoyo_names),
+                dtype=float, count=len(self._apoyo_names),
+            )
+            self._reacciones_arr = (reacciones, R)
+        return self._reacciones_arr[1]
+
+    def _sumas_cargas_totales(self) -> Tuple[float, float]:
+        """(ΣP, ΣM respecto a x=0) de todas las cargas; ``agregar_carga`` las actualiza."""
+        if self._sumas_cargas is None:
+            totales, momentos0 = self._arrays_cargas()
+            self._sumas_cargas = (float(totales.sum()), float(momentos0.sum()))
+        return self._sumas_cargas
+
+    def _firma_configuracion(self) -> Tuple[Any, ...]:
+        """Firma hashable de la configuración: (L, E, I, apoyos, cargas)."""
+        return (
+            float(self.longitud), float(self.E), float(self.I),
+            tuple((float(a.posicion), a.nombre) for a in self.apoyos),
+            tuple(c._signature() for c in self.cargas),
+        )
 
     def tipo_sistema(self) -> str:
         """Determina el tipo de sistema estructural.
@@ -654,29 +1471,30 @@ class Viga:
             'advertencias': List[str]
         }
         """
+        n_apoyos = len(self.apoyos)
+        tipo = self.tipo_sistema()
+        grado = self.grado_hiperestaticidad()
         resultado = {
             'valido': True,
-            'tipo': self.tipo_sistema(),
-            'grado': self.grado_hiperestaticidad(),
+            'tipo': tipo,
+            'grado': grado,
             'mensajes': [],
             'advertencias': []
         }
         
-        n_apoyos = len(self.apoyos)
-        
         if n_apoyos == 0:
             resultado['valido'] = False
             resultado['mensajes'].append("❌ No hay apoyos definidos")
             return resultado
         
         # NUEVA VALIDACIÓN: Verificar orden de apoyos
-        posiciones = [ap.posicion for ap in self.apoyos]
-        if posiciones != sorted(posiciones):
+        distancias = np.diff(self._apoyo_pos)
+        if np.any(distancias < 0):
             resultado['advertencias'].append("⚠️ Los apoyos no están ordenados por posición")
         
         # NUEVA VALIDACIÓN: Detectar apoyos duplicados (misma posición)
-        for i in range(len(self.apoyos) - 1):
-            dist = self.apoyos[i+1].posicion - self.apoyos[i].posicion
+        for i in np.flatnonzero(distancias < 1e-3):
+            dist = distancias[i]
             if dist < 1e-9:  # Duplicados exactos
                 resultado['valido'] = False
                 resultado['mensajes'].append(
@@ -691,23 +1509,25 @@ class Viga:
         
         # NUEVA VALIDACIÓN: Verificar que apoyos intermedios estén dentro del vano
         if n_apoyos > 2:
-            for apoyo in self.apoyos[1:-1]:  # Apoyos intermedios (no extremos)
-                if apoyo.posicion <= 1e-9 or apoyo.posicion >= (self.longitud - 1e-9):
-                    resultado['advertencias'].append(
-                        f"⚠️ Apoyo intermedio '{apoyo.nombre}' está en el extremo "
-                        f"(x={apoyo.posicion:.6f} m, L={self.longitud:.6f} m)"
-                    )
+            # Apoyos intermedios (no extremos) en x≈0 o x≈L, de una vez sobre el arreglo
+            pos_int = self._apoyo_pos[1:-1]
+            en_extremo = (pos_int <= 1e-9) | (pos_int >= self.longitud - 1e-9)
+            for i in np.flatnonzero(en_extremo):
+                apoyo = self.apoyos[i + 1]
+                resultado['advertencias'].append(
+                    f"⚠️ Apoyo intermedio '{apoyo.nombre}' está en el extremo "
+                    f"(x={apoyo.posicion:.6f} m, L={self.longitud:.6f} m)"
+                )
         
         if n_apoyos == 1:
             resultado['advertencias'].append("⚠️ Sistema hipostático (1 apoyo). Solo se puede analizar como ménsula si hay empotramiento")
         
-        if resultado['tipo'] == 'hipostatico':
+        if tipo == 'hipostatico':
             resultado['valido'] = False
             resultado['mensajes'].append(f"❌ Sistema hipostático: insuficientes apoyos ({n_apoyos} < 2)")
-        elif resultado['tipo'] == 'isostatico':
+        elif tipo == 'isostatico':
             resultado['mensajes'].append(f"✓ Sistema isostático: {n_apoyos} apoyos (estáticamente determinado)")
         else:  # hiperestatico
-            grado = resultado['grado']
             resultado['mensajes'].append(f"✓ Sistema hiperestático de grado {grado}: {n_apoyos} apoyos")
             resultado['advertencias'].append(f"ℹ️ Se resolverá por método de compatibilidad de deflexiones")
         
@@ -748,7 +1568,7 @@ class Viga:
         if n_apoyos == 1:
             # Caso especial: un solo apoyo (sistema hipostático sin momento)
             # Solo puede equilibrar si todas las cargas pasan por el apoyo
-            suma_cargas = sum(c.total_load() for c in self.cargas)
+            suma_cargas, _ = self._sumas_cargas_totales()
             self._reacciones = {self.apoyos[0].nombre: suma_cargas}
             
             if self.debug:
@@ -760,10 +1580,10 @@ class Viga:
             apoyo_izq = self.apoyos[0]
             apoyo_der = self.apoyos[1]
             
-            suma_cargas = sum(c.total_load() for c in self.cargas)
+            suma_cargas, momento0 = self._sumas_cargas_totales()
             
-            # Momentos respecto al apoyo izquierdo
-            momentos = sum(c.moment_about(apoyo_izq.posicion) for c in self.cargas)
+            # Momentos respecto al apoyo izquierdo: M(a) = M(0) - ΣP·a
+            momentos = momento0 - suma_cargas * apoyo_izq.posicion
             
             distancia = apoyo_der.posicion - apoyo_izq.posicion
             if abs(distancia) < 1e-12:
@@ -788,6 +1608,19 @@ class Viga:
         if self.debug:
             print(f"[Viga] Sistema hiperestático con {n_apoyos} apoyos (grado {n_apoyos - 2})")
         
+        # Con EI uniforme, EI se cancela en las ecuaciones de compatibilidad:
+        # las reacciones sólo dependen de L, apoyos y cargas, así que barridos
+        # de material o sección reutilizan la misma entrada
+        L_, _E, _I, *resto = self._firma_configuracion()
+        firma = (L_, *resto)
+        cache = Viga._reacciones_cache
+        if firma in cache:
+            cache.move_to_end(firma)
+            self._reacciones = dict(cache[firma])
+            if self.debug:
+                print(f"[Viga] Reacciones recuperadas de caché: {self._reacciones}")
+            return self._reacciones
+        
         try:
             
             # Identificar apoyos primarios (extremos) y redundantes (intermedios)
@@ -801,64 +1634,63 @@ class Viga:
                 print(f"[Viga] Apoyos redundantes: {[f'{a.nombre} (x={a.posicion})' for a in apoyos_redundantes]}")
             
             # Paso 1: Calcular reacciones del sistema primario (solo extremos) con todas las cargas
-            viga_primaria = Viga(self.longitud, self.E, self.I, 
-                               apoyos=[apoyo_izq, apoyo_der],
-                               debug=False)
-            for carga in self.cargas:
-                viga_primaria.agregar_carga(carga)
-            
-            reacciones_primarias = viga_primaria.calcular_reacciones()
+            # Estática directa con los totales ya acumulados: ΣM respecto al apoyo izquierdo
+            L_ref = apoyo_der.posicion - apoyo_izq.posicion
+            suma_cargas, momento0 = self._sumas_cargas_totales()
+            R_der_prim = (momento0 - suma_cargas * apoyo_izq.posicion) / L_ref
+            reacciones_primarias = {
+                apoyo_izq.nombre: suma_cargas - R_der_prim,
+                apoyo_der.nombre: R_der_prim,
+            }
             
             # Paso 2: Calcular deflexiones en posiciones de apoyos redundantes (sistema primario con cargas)
+            # Forma cerrada de Macaulay evaluada exactamente en cada apoyo redundante,
+            # sin construir una viga auxiliar
+            posiciones_red = np.array([a.posicion for a in apoyos_redundantes], dtype=float)
+            pos_primarios = np.array([apoyo_izq.posicion, apoyo_der.posicion], dtype=float)
             try:
-                generar_dataframe = _import_generar_dataframe()
-                df_primario = generar_dataframe(viga_primaria, num_puntos=1000)
-            except (ImportError, Exception):
-                # Fallback: evaluar numéricamente
-                resultados_primarios = viga_primaria._evaluar_numerico(1000)
-                df_primario = pd.DataFrame(resultados_primarios)
-            
-            # Interpolar deflexiones en posiciones de apoyos redundantes
-            deflexiones_cargas = np.zeros(n_redundantes)
-            for i, apoyo_red in enumerate(apoyos_redundantes):
-                # Encontrar deflexión en la posición del apoyo redundante
-                idx = np.argmin(np.abs(df_primario['x'].to_numpy() - apoyo_red.posicion))
-                deflexiones_cargas[i] = df_primario.iloc[idx]['deflexion']
+                deflexiones_cargas = _deflexion_macaulay_apoyos(
+                    posiciones_red, pos_primarios,
+                    np.array([suma_cargas - R_der_prim, R_der_prim]),
+                    self.cargas, self.E * self.I,
+                )
+            except NotImplementedError:
+                # Cargas sin forma cerrada: evaluar la viga primaria en malla
+                viga_primaria = Viga(self.longitud, self.E, self.I,
+                                   apoyos=[apoyo_izq, apoyo_der],
+                                   debug=False)
+                for carga in self.cargas:
+                    viga_primaria.agregar_carga(carga)
+                deflexiones_cargas = viga_primaria._deflexion_en_apoyos(posiciones_red)
             
             if self.debug:
                 print(f"[Viga] Deflexiones por cargas en redundantes: {deflexiones_cargas}")
             
-            # Paso 3: Calcular coeficientes de flexibilidad
-            # f_ij = deflexión en apoyo i debido a reacción unitaria hacia arriba en apoyo j
-            matriz_flexibilidad = np.zeros((n_redundantes, n_redundantes))
-            
-            for j, apoyo_j in enumerate(apoyos_redundantes):
-                # Aplicar reacción unitaria hacia arriba en apoyo j
-                # (carga hacia abajo negativa equivale a reacción hacia arriba)
-                viga_unitaria = Viga(self.longitud, self.E, self.I,
-                                   apoyos=[apoyo_izq, apoyo_der],
-                                   debug=False)
-                carga_unitaria = CargaPuntual(magnitud=-1.0, posicion=apoyo_j.posicion)
-                viga_unitaria.agregar_carga(carga_unitaria)
+            # Atajo: si el sistema primario ya no se desplaza en los apoyos
+            # redundantes (p. ej. sin cargas o cargas que se anulan), las
+            # redundantes son nulas y no hace falta la matriz de flexibilidad.
+            # Escala de referencia: deflexión de Σ|P| y Σ|M0| en una luz L.
+            suma_P = float(np.abs(self._arrays_cargas()[0]).sum())
+            suma_M = sum(abs(c.magnitud) for c in self.cargas_momento)
+            escala = (suma_P * L_ref**3 + suma_M * L_ref**2) / (self.E * self.I)
+            if np.max(np.abs(deflexiones_cargas)) <= 1e-12 * max(escala, 1e-300):
+                reacciones_redundantes = np.zeros(n_redundantes)
+            else:
+                # Paso 3: Calcular coeficientes de flexibilidad
+                # f_ij = deflexión en apoyo i debido a reacción unitaria hacia arriba en apoyo j
+                # (carga hacia abajo negativa equivale a reacción hacia arriba); todas las
+                # columnas se evalúan juntas por broadcasting, sin construir vigas auxiliares
+                matriz_flexibilidad = _matriz_deflexion_unitaria(
+                    posiciones_red, posiciones_red,
+                    apoyo_izq.posicion, apoyo_der.posicion, self.E * self.I,
+                )
                 
-                try:
-                    generar_dataframe = _import_generar_dataframe()
-                    df_unit = generar_dataframe(viga_unitaria, num_puntos=1000)
-                except (ImportError, Exception):
-                    resultados_unit = viga_unitaria._evaluar_numerico(1000)
-                    df_unit = pd.DataFrame(resultados_unit)
+                if self.debug:
+                    print(f"[Viga] Matriz de flexibilidad:\n{matriz_flexibilidad}")
                 
-                # Calcular deflexiones en todos los apoyos redundantes
-                for i, apoyo_i in enumerate(apoyos_redundantes):
-                    idx = np.argmin(np.abs(df_unit['x'].to_numpy() - apoyo_i.posicion))
-                    matriz_flexibilidad[i, j] = df_unit.iloc[idx]['deflexion']
-            
-            if self.debug:
-                print(f"[Viga] Matriz de flexibilidad:\n{matriz_flexibilidad}")
-            
-            # Paso 4: Resolver sistema [f]·{R_redundantes} = -{δ_cargas}
-            # (negativo porque queremos que la suma dé cero)
-            reacciones_redundantes = np.linalg.solve(matriz_flexibilidad, -deflexiones_cargas)
+                # Paso 4: Resolver sistema [f]·{R_redundantes} = -{δ_cargas}
+                # (negativo porque queremos que la suma dé cero)
+                reacciones_redundantes = np.linalg.solve(matriz_flexibilidad, -deflexiones_cargas)
             
             if self.debug:
                 print(f"[Viga] Reacciones redundantes: {reacciones_redundantes}")
@@ -866,20 +1698,16 @@ class Viga:
             # Paso 5: Calcular reacciones finales en apoyos primarios
             # Superposición: reacciones totales = reacciones_primarias + efecto de redundantes
             
-            # Las reacciones redundantes son positivas hacia arriba
-            # Necesitamos calcular su efecto en los apoyos extremos
-            # Creamos cargas hacia abajo que representan estas reacciones
-            viga_redundantes = Viga(self.longitud, self.E, self.I,
-                                  apoyos=[apoyo_izq, apoyo_der],
-                                  debug=False)
-            for i, apoyo_red in enumerate(apoyos_redundantes):
-                # Convertir reacción (hacia arriba, positiva) en carga equivalente (hacia abajo, negativa)
-                # Magnitud negativa en CargaPuntual equivale a reacción hacia arriba
-                carga_equivalente = CargaPuntual(magnitud=-reacciones_redundantes[i], 
-                                               posicion=apoyo_red.posicion)
-                viga_redundantes.agregar_carga(carga_equivalente)
-            
-            reacciones_por_redundantes = viga_redundantes.calcular_reacciones()
+            # Las reacciones redundantes son positivas hacia arriba: equivalen a
+            # cargas hacia abajo -R_i en el sistema primario (isostático), cuyas
+            # reacciones en los extremos salen de la estática en forma cerrada:
+            # R_der = Σ(-R_i)·(a_i - x_izq)/L_ref,  R_izq = Σ(-R_i) - R_der
+            brazo = (posiciones_red - apoyo_izq.posicion) / L_ref
+            R_der_red = float(-(reacciones_redundantes * brazo).sum())
+            reacciones_por_redundantes = {
+                apoyo_izq.nombre: float(-reacciones_redundantes.sum()) - R_der_red,
+                apoyo_der.nombre: R_der_red,
+            }
             
             # Superposición final: 
             # R_extremos_total = R_por_cargas_externas + R_por_reacciones_internas
@@ -900,9 +1728,12 @@ class Viga:
             if self.debug:
                 print(f"[Viga] Reacciones finales: {self._reacciones}")
                 suma_reacciones = sum(self._reacciones.values())
-                suma_cargas_total = sum(c.total_load() for c in self.cargas)
+                suma_cargas_total = self._sumas_cargas_totales()[0]
                 print(f"[Viga] Verificación: ΣR={suma_reacciones:.6f} N, ΣF={suma_cargas_total:.6f} N, error={abs(suma_reacciones - suma_cargas_total):.6e} N")
             
+            cache[firma] = dict(self._reacciones)
+            if len(cache) > Viga._REACCIONES_CACHE_MAX:
+                cache.popitem(last=False)
             return self._reacciones
             
         except Exception as e:
@@ -912,6 +1743,75 @@ class Viga:
                 traceback.print_exc()
             raise RuntimeError(f"No se pudieron calcular las reacciones hiperestáticas: {e}")
 
+    # ----------------------- Deflexión cerrada (Macaulay) -----------------------
+
+    def _deflexion_macaulay(self, x_eval: np.ndarray) -> np.ndarray:
+        """Deflexión y(x) en los puntos dados mediante fórmulas cerradas de Macaulay.
+
+        EI·y(x) = Σ R<x-s>³/6 + Σ F_carga(x) + C1·x + C2, con C1 y C2 fijados
+        por y = 0 en los apoyos extremos. No usa SymPy ni mallas, por lo que
+        es exacta en cualquier x (en particular, en los apoyos redundantes).
+        Todos los términos se reúnen en arreglos (coef, a, n) y se evalúan
+        con un único ``_sumar_macaulay`` (ver ``_deflexion_macaulay_apoyos``).
+
+        Raises
+        ------
+        NotImplementedError
+            Si alguna carga no define ``deflection_terms``.
+        """
+        R = self._reacciones_array()
+        return _deflexion_macaulay_apoyos(x_eval, self._apoyo_pos, R, self.cargas, self.E * self.I)
+
+    def _campos_macaulay(self, x_eval: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """(V, M, θ, y) exactos en los puntos dados (ver ``_campos_macaulay_apoyos``).
+
+        Raises
+        ------
+        NotImplementedError
+            Si alguna carga no define ``deflection_terms`` o hay menos de dos
+            apoyos (sin ellos no se fijan C1 y C2).
+        """
+        if self._apoyo_pos.size < 2:
+            raise NotImplementedError("Se requieren al menos dos apoyos")
+        R = self._reacciones_array()
+        return _campos_macaulay_apoyos(x_eval, self._apoyo_pos, R, self.cargas, self.E * self.I)
+
+    def _cortante_macaulay(self, x_eval: np.ndarray) -> np.ndarray:
+        """V(x) en los puntos dados, sin SymPy, a partir de los términos de Macaulay.
+
+        V = d³(EI·y)/dx³: los parámetros de todas las cargas y reacciones se
+        reúnen en arreglos (coef, a, n) y se derivan término a término; los
+        pares concentrados no aportan a V. Los escalones usan H(0)=1 y se
+        aplica la misma ventana H(x) - H(x-L) que ``_construir_cortante_expr``.
+
+        Raises
+        ------
+        NotImplementedError
+            Si alguna carga no define ``deflection_terms``.
+        """
+        terminos = list(zip(self._reacciones_array() / 6.0, self._apoyo_pos, (3,) * self._apoyo_pos.size))
+        for c in self.cargas:
+            terminos.extend(c.deflection_terms())
+        coef, offset, exponente = _derivar_macaulay(
+            *(np.array(col, dtype=float) for col in zip(*terminos)), orden=3
+        )
+        x_eval = np.asarray(x_eval, dtype=float)
+        ventana = (x_eval > 0.0) & (x_eval <= float(self.longitud))
+        return np.where(ventana, _sumar_escalones_macaulay(x_eval, coef, offset, exponente), 0.0)
+
+    def _deflexion_en_apoyos(self, posiciones: np.ndarray) -> np.ndarray:
+        """Deflexión en las posiciones dadas; usa la malla numérica si falta la forma cerrada."""
+        try:
+            return self._deflexion_macaulay(posiciones)
+        except NotImplementedError:
+            pass
+        # Arreglos de evaluar() directamente (lo mismo que generar_dataframe,
+        # sin construir el DataFrame); evaluar() recurre a _evaluar_numerico si falla
+        resultados = self.evaluar(num_puntos=1000)
+        x_arr = np.asarray(resultados['x'], dtype=float)
+        defl_arr = np.asarray(resultados['deflexion'], dtype=float)
+        return np.interp(np.asarray(posiciones, dtype=float), x_arr, defl_arr)
+
     # ----------------------- Construcción simbólica -----------------------
 
     def _construir_cortante_expr(self) -> sp.Expr:
@@ -926,32 +1826,137 @@ class Viga:
         
         V(x) = Σ(reacciones a la izquierda) - Σ(cargas a la izquierda)
         
-        Las funciones Heaviside controlan cuándo cada término se activa:
-        - Reacciones: H(x - a) activa desde x ≥ a
-        - Límite de viga: [1 - H(x - L)] limita al dominio [0, L]
-        - Cargas puntuales: -P * H(x - a) resta desde x ≥ a
+        Los saltos concentrados forman un Piecewise escalonado:
+        - Reacciones: +R desde x ≥ a
+        - Cargas puntuales: -P desde x ≥ a
+        - Límite de viga: [H(x) - H(x - L)] limita al dominio [0, L]
+        Las cargas distribuidas se suman como términos de Macaulay.
         """
-        reacciones = self.calcular_reacciones()
+        clave = (
+            float(self.longitud),
+            tuple(zip(self._apoyo_pos.tolist(), self._reacciones_array().tolist())),
+            tuple(c._signature() for c in self.cargas),
+        )
+        cache = Viga._shear_cache
+        if clave in cache:
+            cache.move_to_end(clave)
+            return cache[clave]
 
         # Límite del dominio: solo en [0, L]
         # Multiplicamos todo por una ventana [H(x) - H(x-L)] para asegurar V=0 fuera de [0,L]
         ventana = heaviside(x) - heaviside(x - self.longitud)
         
-        V_expr = sp.Float(0.0)
+        # Saltos concentrados (reacciones +R, cargas puntuales -P) agrupados por
+        # posición en un único Piecewise escalonado: k tramos en lugar de una
+        # suma de Heaviside por apoyo y por carga. Cada salto actúa desde x=a
+        # inclusive, igual que H(x-a, 1).
+        saltos = self._saltos_cortante()
+
+        tramos = []
+        acumulado = 0.0
+        for pos in sorted(saltos):
+            tramos.append((acumulado, x < pos))
+            acumulado += saltos[pos]
+        tramos.append((acumulado, True))
+        # Cargas distribuidas: monomios de Macaulay (los pares no alteran V).
+        # Un único sp.Add canonicaliza todos los términos de una vez, en lugar
+        # de reordenar la suma en cada +=.
+        V_expr = sp.Add(
+            sp.Piecewise(*tramos),
+            *(
+                termino
+                for termino in (c.shear_expression(x) for c in self.cargas if not isinstance(c, CargaPuntual))
+                if termino is not sp.S.Zero
+            ),
+        )
 
-        # Agregar reacciones de todos los apoyos
-        # Usamos H(x-a, 1) para que la reacción actúe exactamente desde x=a
-        for apoyo in self.apoyos:
-            V_expr += sp.Float(reacciones[apoyo.nombre]) * sp.Heaviside(x - apoyo.posicion, 1)
+        # Aplicar ventana para limitar al dominio [0, L]
+        # (la suma de escalones y monomios de Macaulay ya es canónica: sin simplify)
+        V_expr = V_expr * ventana
+
+        cache[clave] = V_expr
+        if len(cache) > Viga._SHEAR_CACHE_MAX:
+            cache.popitem(last=False)
+        return V_expr
 
-        # Agregar contribuciones de las cargas (signo negativo introduce saltos descendentes)
+    def _saltos_cortante(self) -> Dict[float, float]:
+        """Saltos concentrados de V(x) agrupados por posición: +R en apoyos, -P en cargas puntuales."""
+        saltos: Dict[float, float] = {}
+        for pos, R in zip(self._apoyo_pos.tolist(), self._reacciones_array().tolist()):
+            saltos[pos] = saltos.get(pos, 0.0) + R
         for carga in self.cargas:
-            V_expr += carga.shear_expression(x)
+            if isinstance(carga, CargaPuntual):
+                pos = float(carga.posicion)
+                saltos[pos] = saltos.get(pos, 0.0) - float(carga.magnitud)
+        return saltos
 
-        # Aplicar ventana para limitar al dominio [0, L]
-        V_expr = V_expr * ventana
-        
-        return sp.simplify(V_expr)
+    def _saltos_momento(self) -> Dict[float, float]:
+        """Saltos de M(x) por pares concentrados, agrupados por posición.
+
+        Un par sobre un apoyo con ``en_vano=False`` no entra al vano.
+        """
+        saltos: Dict[float, float] = {}
+        for c in self.cargas_momento:
+            a = float(c.posicion)
+            if not c.en_vano and self._en_apoyo(a):
+                continue
+            saltos[a] = saltos.get(a, 0.0) + float(c.magnitud)
+        return saltos
+
+    def _momento_por_tramos(self) -> sp.Expr:
+        """M(x) = ∫₀ˣ V dξ + Σ M0·H(x-a) como Piecewise de polinomios, tramo a tramo.
+
+        Entre nudos consecutivos V(x) es un polinomio: los escalones valen 0 o 1
+        y los monomios de Macaulay se reducen a (x-a)^n. Cada tramo se integra
+        con ``Poly.integrate`` y se arranca en el valor acumulado del tramo
+        anterior, sin ``sp.integrate`` general ni ``simplify``. Los pares
+        concentrados suman M0 a la derecha de su posición y M0/2 justo en ella
+        (H(0)=1/2), sin dejar Heaviside en la expresión.
+        """
+        L = float(self.longitud)
+        saltos = self._saltos_cortante()
+        saltos_M = self._saltos_momento()
+        distribuidas = [c for c in self.cargas if not isinstance(c, (CargaPuntual, CargaMomento))]
+
+        nudos = {0.0, L}
+        nudos.update(p for p in saltos if 0.0 < p < L)
+        nudos.update(p for p in saltos_M if 0.0 < p < L)
+        for c in distribuidas:
+            nudos.update(p for p in (float(c.inicio), float(c.fin)) if 0.0 < p < L)
+        nudos = sorted(nudos)
+
+        def punto_de_salto(pos: float, M_continuo: float) -> Tuple[sp.Expr, sp.Basic]:
+            previo = sum(m for a, m in saltos_M.items() if a < pos)
+            return M_continuo + previo + 0.5 * saltos_M[pos], sp.Eq(x, pos)
+
+        tramos = [(sp.S.Zero, x < 0)]
+        M_acum = 0.0
+        for izq, der in zip(nudos[:-1], nudos[1:]):
+            medio = 0.5 * (izq + der)
+            if izq in saltos_M:
+                tramos.append(punto_de_salto(izq, M_acum))
+
+            def escalon(h: sp.Heaviside) -> sp.Integer:
+                return sp.S.One if float(h.args[0].subs(x, medio)) > 0 else sp.S.Zero
+
+            V_tramo = sp.Add(
+                sum(salto for pos, salto in saltos.items() if pos <= izq),
+                *(
+                    c.shear_expression(x).replace(lambda e: isinstance(e, sp.Heaviside), escalon)
+                    for c in distribuidas
+                ),
+            )
+            primitiva = sp.Poly(V_tramo, x).integrate()
+            base = primitiva.eval(izq)
+            M_tramo = primitiva.as_expr() - base + M_acum
+            M_pares = sum(m for a, m in saltos_M.items() if a <= izq)
+            tramos.append((M_tramo + M_pares, x < der))
+            # Valor al final del tramo por Horner sobre el Poly, sin subs en el árbol
+            M_acum = float(primitiva.eval(der) - base) + M_acum
+        if L in saltos_M:
+            tramos.append(punto_de_salto(L, M_acum))
+        tramos.append((M_acum + sum(saltos_M.values()), True))
+        return sp.Piecewise(*tramos)
 
     def _construir_expresiones(self) -> Dict[str, sp.Expr]:
         """Ensamblado simbólico completo de V, M, θ y y.
@@ -962,26 +1967,50 @@ class Viga:
         3. Integrar M/EI para θ(x) y luego para y(x) (con fallback simplificado).
         4. Aplicar condiciones de borde y(x_apoyo_i)=0 para todos los apoyos.
         """
-        if self._expresiones is not None:
+        cfg_key = self._firma_configuracion()
+        if self._expresiones is not None and cfg_key == self._cfg_key:
+            return self._expresiones
+        if cfg_key != self._cfg_key:
+            # Apoyos o cargas modificados in situ (p. ej. edición desde la UI):
+            # lo derivado de la configuración anterior deja de ser válido
+            self._reacciones = None
+            self._load_cache = None
+            self._cargas_momento = None
+            self._sumas_cargas = None
+            self._lambdas = None
+            self._expresiones = None
+        # V, M, θ y y son sumas sobre las cargas: el orden en que se agregaron
+        # no cambia el resultado, así que la clave usa las firmas ordenadas
+        *geometria, firmas_cargas = cfg_key
+        clave = (*geometria, tuple(sorted(firmas_cargas, key=repr)))
+        cache = Viga._expresiones_cache
+        guardadas = cache.get(clave)
+        if guardadas is not None:
+            cache.move_to_end(clave)
+            self._expresiones = dict(guardadas)
+            self._cfg_key = cfg_key
             return self._expresiones
         if self.debug:
             print(f"[Viga] Construyendo expresiones simbólicas (L={self.longitud}, cargas={len(self.cargas)}, apoyos={len(self.apoyos)})")
+        Viga._construcciones += 1
+        if Viga._construcciones % Viga._LIMPIAR_CACHE_SYMPY_CADA == 0:
+            clear_cache()
 
         try:
             V_expr = self._construir_cortante_expr()
 
-            xi = sp.symbols("xi", real=True, nonnegative=True)
+            saltos_incluidos = True
             try:
-                M_expr = sp.integrate(V_expr.subs(x, xi), (xi, 0, x))
-                M_expr = sp.simplify(M_expr)
+                M_expr = self._momento_por_tramos()
             except Exception as e:
+                saltos_incluidos = False
                 if self.debug:
-                    print(f"[Viga] Advertencia integración momento (método 1): {e}")
+                    print(f"[Viga] Advertencia integración momento (por tramos): {e}")
                     print("[Viga] Intentando método alternativo...")
                 try:
-                    M_expr = sp.integrate(V_expr, x)
-                    M_expr = M_expr - M_expr.subs(x, 0)
-                    M_expr = sp.simplify(M_expr)
+                    M_expr = _integrar_x(V_expr)
+                    # Polinomios y escalones: expand basta, simplify no aporta
+                    M_expr = sp.expand(M_expr - M_expr.subs(x, 0))
                 except Exception as e2:
                     if self.debug:
                         print(f"[Viga] Error también en método alternativo de momento: {e2}")
@@ -1005,18 +2034,17 @@ class Viga:
             #
             # Usamos H(0)=1/2 para evaluar correctamente en x=a
             # ============================================================
-            if any(isinstance(c, CargaMomento) for c in self.cargas):
-                for c in self.cargas:
-                    if isinstance(c, CargaMomento):
-                        a = float(c.posicion)
-                        # Si el momento está exactamente en un apoyo y en_vano es False, no aplicar el salto dentro del vano
-                        esta_en_apoyo = any(abs(a - apoyo.posicion) < 1e-12 for apoyo in self.apoyos)
-                        if esta_en_apoyo and not c.en_vano:
-                            continue
-                        M_expr += sp.Float(c.magnitud) * heaviside_half(x - c.posicion)
-                M_expr = sp.simplify(M_expr)
-
-            EI = sp.Float(self.E * self.I)
+            # (el Piecewise por tramos ya los incorpora; solo la ruta alternativa los suma aquí)
+            if not saltos_incluidos and self.cargas_momento:
+                M_expr = sp.Add(
+                    M_expr, *(M0 * heaviside_half(x - a) for a, M0 in self._saltos_momento().items())
+                )
+                # Polinomios por tramos + escalones: expand basta (simplify
+                # ensaya estrategias trigonométricas/hipergeométricas inútiles aquí)
+                M_expr = sp.expand(M_expr)
+
+            # Constante numérica: se aplica tras integrar M, fuera del integrando
+            EI = float(self.E * self.I)
             if EI == 0:
                 raise ValueError("El producto EI no puede ser cero")
 
@@ -1029,35 +2057,49 @@ class Viga:
                 # Caso clásico con 2 constantes
                 C1, C2 = sp.symbols("C1 C2")
                 try:
-                    theta_expr = sp.integrate(M_expr / EI, x) + C1
-                    y_expr = sp.integrate(theta_expr, x) + C2
+                    theta_expr = _integrar_x(M_expr) / EI + C1
+                    y_expr = _integrar_x(theta_expr) + C2
                 except Exception as e:
                     if self.debug:
                         print(f"[Viga] Advertencia integración deflexión: {e}")
                     try:
-                        theta_expr = sp.simplify(M_expr / EI) * x + C1
-                        y_expr = sp.integrate(theta_expr, x) + C2
+                        theta_expr = M_expr * x / EI + C1
+                        y_expr = _integrar_x(theta_expr) + C2
                     except Exception as e2:
                         if self.debug:
                             print(f"[Viga] Error en alternativa de deflexión: {e2}")
                         raise RuntimeError(f"No se pudo calcular las expresiones de deflexión: {e}")
 
-                # Aplicar condiciones de borde en los apoyos disponibles
-                ecuaciones = []
-                for apoyo in self.apoyos[:2]:  # Usar los primeros 2 apoyos
-                    ecuaciones.append(sp.Eq(y_expr.subs(x, apoyo.posicion), 0))
-                
-                # Si solo hay 1 apoyo, agregar condición de momento nulo ahí
-                if n_apoyos == 1:
-                    ecuaciones.append(sp.Eq(M_expr.subs(x, self.apoyos[0].posicion), 0))
-                
                 try:
-                    solucion = sp.solve(ecuaciones, (C1, C2), simplify=True, dict=True)
-                    if not solucion:
-                        raise RuntimeError("No fue posible determinar las constantes de integración")
-                    constants = solucion[0]
-                    theta_expr = sp.simplify(theta_expr.subs(constants))
-                    y_expr = sp.simplify(y_expr.subs(constants))
+                    if n_apoyos == 2:
+                        # y(x) es lineal en C1, C2: y(a1)=y(a2)=0 es un sistema 2×2
+                        # que se resuelve en forma cerrada (Cramer), sin sp.solve
+                        filas = []
+                        for apoyo in self.apoyos:
+                            p = apoyo.posicion
+                            filas.append((
+                                y_expr.diff(C1).subs(x, p),
+                                y_expr.diff(C2).subs(x, p),
+                                -y_expr.subs({C1: 0, C2: 0}).subs(x, p),
+                            ))
+                        (a11, a12, b1), (a21, a22, b2) = filas
+                        det = a11 * a22 - a12 * a21
+                        if det == 0:
+                            raise RuntimeError("No fue posible determinar las constantes de integración")
+                        constants = {C1: (b1 * a22 - b2 * a12) / det, C2: (b2 * a11 - b1 * a21) / det}
+                    else:
+                        # Un solo apoyo: y=0 y momento nulo en él. M no depende de
+                        # C1, C2 (si no se anula, el sistema es incompatible) e
+                        # y(p) = y0(p) + C1·p + C2 = 0 fija sólo una constante.
+                        # Convenio de _evaluar_numerico: θ(0) = 0 (C1 = 0) y la
+                        # deflexión se desplaza para que y(p) = 0
+                        p = self.apoyos[0].posicion
+                        if M_expr.subs(x, p) != 0:
+                            raise RuntimeError("No fue posible determinar las constantes de integración")
+                        y0_p = y_expr.subs({C1: 0, C2: 0}).subs(x, p)
+                        constants = {C1: 0, C2: -y0_p}
+                    theta_expr = sp.collect(sp.expand(theta_expr.subs(constants)), x)
+                    y_expr = sp.collect(sp.expand(y_expr.subs(constants)), x)
                 except Exception as e:
                     if self.debug:
                         print(f"[Viga] Error resolviendo constantes: {e}")
@@ -1071,6 +2113,10 @@ class Viga:
                 raise RuntimeError("Sistema con >2 apoyos: se requiere método numérico")
 
             self._expresiones = {"V": V_expr, "M": M_expr, "theta": theta_expr, "deflexion": y_expr}
+            self._cfg_key = cfg_key
+            cache[clave] = dict(self._expresiones)
+            if len(cache) > Viga._EXPRESIONES_CACHE_MAX:
+                cache.popitem(last=False)
             return self._expresiones
 
         except Exception as e:
@@ -1081,7 +2127,29 @@ class Viga:
     def obtener_expresiones(self) -> Dict[str, sp.Expr]:
         return self._construir_expresiones()
 
-    def evaluar(self, num_puntos: int = 400) -> Dict[str, List[float]]:
+    def _funcion_cortante(self) -> Callable:
+        """V(x) como función NumPy vectorizada, lambdificada una sola vez."""
+        if self._lambdas is None:
+            self._lambdas = {}
+        if "V" not in self._lambdas:
+            self._lambdas["V"] = _lambdificar(self._construir_cortante_expr())
+        return self._lambdas["V"]
+
+    def obtener_funciones(self) -> Dict[str, Callable]:
+        """Funciones vectorizadas de V, M, θ y y (ver ``_lambdificar``), memorizadas en la viga.
+
+        Cada función acepta un arreglo completo de x, de modo que una curva se
+        evalúa con una sola llamada.
+        """
+        expresiones = self._construir_expresiones()
+        if self._lambdas is None:
+            self._lambdas = {}
+        for nombre, expr in expresiones.items():
+            if nombre not in self._lambdas:
+                self._lambdas[nombre] = _lambdificar(expr)
+        return {nombre: self._lambdas[nombre] for nombre in expresiones}
+
+    def evaluar(self, num_puntos: int = 400) -> Dict[str, np.ndarray]:
         """Evalúa V(x), M(x), θ(x), y(x) usando integración por sub-tramos con nudos.
 
         NUEVO MÉTODO (Oct 2025): Integración por sub-tramos que garantiza:
@@ -1102,14 +2170,9 @@ class Viga:
             puntos_por_tramo = max(20, num_puntos // max(2, len(self.apoyos) + len(self.cargas)))
             datos = evaluar_por_subtramos(self, puntos_por_tramo=puntos_por_tramo)
             
-            # Convertir a listas para compatibilidad
-            return {
-                'x': datos['x'].tolist(),
-                'V': datos['V'].tolist(),
-                'M': datos['M'].tolist(),
-                'theta': datos['theta'].tolist(),
-                'deflexion': datos['deflexion'].tolist()
-            }
+            # Filas del bloque de evaluar_por_subtramos tal cual: DataFrame
+            # (vía _bloque_resultados) y np.asarray las consumen sin copiar
+            return {campo: datos[campo] for campo in _CAMPOS_EVALUACION}
         except Exception as e:
             if self.debug:
                 print(f"[Viga] Error en método de sub-tramos ({e}), usando fallback")
@@ -1123,12 +2186,11 @@ class Viga:
         return [c.descripcion() for c in self.cargas]
 
     def intensidad_total(self) -> sp.Expr:
-        expr = sp.Integer(0)
-        for carga in self.cargas:
-            expr += carga.load_intensity(x)
-        return sp.simplify(expr)
+        expr = sp.Add(*(carga.load_intensity(x) for carga in self.cargas))
+        # Suma de polinomios por escalones: expand basta, simplify no aporta
+        return sp.expand(expr)
 
-    def _evaluar_numerico(self, num_puntos: int = 400) -> Dict[str, List[float]]:
+    def _evaluar_numerico(self, num_puntos: int = 400) -> Dict[str, np.ndarray]:
         """Fallback usando integración numérica vectorizada.
 
         Construye V(x) simbólica pero sólo la evalúa numéricamente para evitar
@@ -1142,39 +2204,48 @@ class Viga:
         """
         if self.debug:
             print("[Viga] Usando fallback numérico vectorizado")
-        from scipy.integrate import cumulative_trapezoid
-
-        x_vals = np.linspace(0.0, float(self.longitud), num_puntos)
+        # Misma malla en cada llamada con igual (L, num_puntos): sin reasignar
+        x_vals, dx = _malla_uniforme(float(self.longitud), int(num_puntos))
 
         try:
-            V_expr = self._construir_cortante_expr()
-            V_func = sp.lambdify(x, V_expr, "numpy")
-            V_vals = np.asarray(V_func(x_vals), dtype=float)
+            try:
+                # V directa de los términos de Macaulay: sin árbol SymPy ni lambdify
+                V_vals = self._cortante_macaulay(x_vals)
+            except NotImplementedError:
+                V_vals = _evaluar_en_malla(self._funcion_cortante(), x_vals)
         except Exception as e:
             # Último recurso: construir manualmente R_primer_apoyo + sum(shear_i) + otras reacciones
             if self.debug:
                 print(f"[Viga] Falla construyendo V_expr ({e}), usando suma incremental")
-            reacciones = self.calcular_reacciones()
-            # Construcción consistente con la simbólica: iniciar en 0 y sumar
-            # reacciones de todos los apoyos con escalón en su posición
-            V_vals = np.zeros_like(x_vals, dtype=float)
-            for apoyo in self.apoyos:
-                step = (x_vals >= apoyo.posicion).astype(float)
-                V_vals += float(reacciones[apoyo.nombre]) * step
-
+            # Reacciones y cargas con forma cerrada como columnas (coef, a, n)
+            # de un único juego de arreglos: un solo barrido vectorizado en
+            # lugar de un arreglo temporal por apoyo y por carga. Los escalones
+            # usan H(0)=1 (x >= x_apoyo), igual que la construcción simbólica.
+            terminos = list(zip(self._reacciones_array() / 6.0, self._apoyo_pos, (3,) * self._apoyo_pos.size))
+            sin_forma_cerrada = []
             for carga in self.cargas:
                 try:
-                    contrib = sp.lambdify(x, carga.shear_expression(x), "numpy")(x_vals)
-                    V_vals += np.asarray(contrib, dtype=float)
-                except Exception:
+                    terminos.extend(carga.deflection_terms())
+                except NotImplementedError:
+                    sin_forma_cerrada.append(carga)
+            coef, offset, exponente = _derivar_macaulay(
+                *(np.array(col, dtype=float) for col in zip(*terminos)), orden=3
+            )
+            V_vals = _sumar_escalones_macaulay(x_vals, coef, offset, exponente)
+
+            for carga in sin_forma_cerrada:
+                try:
+                    V_vals += np.asarray(_lambdify_numpy(carga.shear_expression(x))(x_vals), dtype=float)
+                except (sp.SympifyError, TypeError, ValueError) as e:
+                    # Sólo se omiten cargas cuya expresión no se puede evaluar;
+                    # cualquier otro fallo debe propagarse
+                    if self.debug:
+                        print(f"[Viga] Carga omitida en fallback numérico ({carga.descripcion()}): {e}")
                     continue
 
 
-        # Integraciones sucesivas: M(x) = ∫V(x)dx
-        M_vals = cumulative_trapezoid(V_vals, x_vals, initial=0.0)
-        
         # ============================================================
-        # AÑADIR SALTOS POR MOMENTOS CONCENTRADOS (método numérico)
+        # M(x) = ∫V(x)dx + SALTOS POR MOMENTOS CONCENTRADOS (método numérico)
         # ============================================================
         # CORRECCIÓN: Aplicar salto directo (suma M0 donde x > a)
         #   M(x) = M_base(x) + M₀·H(x-a)
@@ -1187,26 +2258,11 @@ class Viga:
         #   M₀ > 0 → Salto hacia ARRIBA
         #   M₀ < 0 → Salto hacia ABAJO
         # ============================================================
-        if any(isinstance(c, CargaMomento) for c in self.cargas):
-            L = float(self.longitud)
-            tol = max(1e-12, 1e-9 * L)
-            
-            for c in self.cargas:
-                if isinstance(c, CargaMomento):
-                    a = float(c.posicion)
-                    # Si es en apoyo y en_vano=False, no afectar el vano
-                    esta_en_apoyo = any(abs(a - apoyo.posicion) < 1e-12 for apoyo in self.apoyos)
-                    if esta_en_apoyo and not c.en_vano:
-                        continue
-                    
-                    # Salto directo: sumar M0 donde x > a (implementación correcta de Heaviside)
-                    magnitud = float(c.magnitud)
-                    M_vals[x_vals > (a + tol)] += magnitud
-                    
-                    # En x = a, sumar M0/2 (convención Heaviside con H(0)=1/2)
-                    idx_at_a = np.argmin(np.abs(x_vals - a))
-                    if abs(x_vals[idx_at_a] - a) < tol:
-                        M_vals[idx_at_a] += magnitud * 0.5
+        # Integral y saltos en un único cumsum; se omiten los pares sobre un
+        # apoyo con en_vano=False
+        saltos_M = self._saltos_momento() if self.cargas_momento else {}
+        tol = max(1e-12, 1e-9 * float(self.longitud))
+        M_vals = integrar_momento(V_vals, x_vals, saltos_M, tol, dx=dx)
         
         # ============================================================
         # AJUSTAR M(x) PARA GARANTIZAR M=0 EN APOYOS
@@ -1215,10 +2271,15 @@ class Viga:
         # Ahora que aplicamos los saltos de momentos puntuales ANTES de esta corrección,
         # es seguro aplicarla siempre (solo evitamos si el error es despreciable < 1e-9)
         n_ap = len(self.apoyos)
+        # Malla uniforme: el nodo más cercano a cada apoyo es round(x/dx), O(1)
+        if dx > 0:
+            idx_apoyos = np.clip(np.rint(self._apoyo_pos / dx).astype(int), 0, x_vals.size - 1)
+        else:
+            idx_apoyos = np.zeros(n_ap, dtype=int)
         if n_ap >= 2:
             # Encontrar índices de los apoyos extremos
-            idx_izq = np.argmin(np.abs(x_vals - self.apoyos[0].posicion))
-            idx_der = np.argmin(np.abs(x_vals - self.apoyos[-1].posicion))
+            idx_izq = idx_apoyos[0]
+            idx_der = idx_apoyos[-1]
             
             # Valores actuales de momento en los extremos
             M_izq = M_vals[idx_izq]
@@ -1237,23 +2298,20 @@ class Viga:
                         print(f"[Viga] Corrección numérica aplicada: M_izq={M_izq:.2e}, M_der={M_der:.2e}")
         elif n_ap == 1:
             # Un solo apoyo: ajustar para M=0 en ese apoyo
-            idx = np.argmin(np.abs(x_vals - self.apoyos[0].posicion))
+            idx = idx_apoyos[0]
             M_apoyo = M_vals[idx]
             
             if abs(M_apoyo) > 1e-9:
                 M_vals = M_vals - M_apoyo
         
         EI = self.E * self.I
-        theta_vals = cumulative_trapezoid(M_vals / EI, x_vals, initial=0.0)
-        y_vals = cumulative_trapezoid(theta_vals, x_vals, initial=0.0)
+        theta_vals, y_vals = integrar_pendiente_deflexion(M_vals, x_vals, EI, dx=dx, saltos=saltos_M)
 
         # Ajustar condiciones de borde y(x_apoyo_i)=0 para todos los apoyos
-        n_ap = len(self.apoyos)
         if n_ap >= 3:
             # Mínimos cuadrados: encontrar a, b que minimicen sum_i (y(x_i) - (a + b x_i))^2
-            x_supp = np.array([ap.posicion for ap in self.apoyos], dtype=float)
-            idxs = [int(np.argmin(np.abs(x_vals - xi))) for xi in x_supp]
-            y_supp = y_vals[idxs]
+            x_supp = self._apoyo_pos
+            y_supp = y_vals[idx_apoyos]
 
             # Matriz de diseño para modelo lineal a + b x
             A = np.column_stack([np.ones_like(x_supp), x_supp])
@@ -1263,10 +2321,7 @@ class Viga:
                 y_vals = y_vals - (a0 + b0 * x_vals)
             except Exception:
                 # Fallback si falla LS: usar extremos como en caso de 2 apoyos
-                apoyo1 = self.apoyos[0]
-                apoyo2 = self.apoyos[1]
-                idx1 = int(np.argmin(np.abs(x_vals - apoyo1.posicion)))
-                idx2 = int(np.argmin(np.abs(x_vals - apoyo2.posicion)))
+                idx1, idx2 = int(idx_apoyos[0]), int(idx_apoyos[1])
                 y1, y2 = y_vals[idx1], y_vals[idx2]
                 x1, x2 = x_vals[idx1], x_vals[idx2]
                 if abs(x2 - x1) > 1e-12:
@@ -1274,12 +2329,7 @@ class Viga:
                     y_vals = y_vals - (y1 + pendiente * (x_vals - x1))
         elif n_ap == 2:
             # Para 2 apoyos: ajuste lineal exacto usando ambos
-            apoyo1 = self.apoyos[0]
-            apoyo2 = self.apoyos[1]
-            
-            # Encontrar índices más cercanos a los apoyos
-            idx1 = np.argmin(np.abs(x_vals - apoyo1.posicion))
-            idx2 = np.argmin(np.abs(x_vals - apoyo2.posicion))
+            idx1, idx2 = idx_apoyos[0], idx_apoyos[1]
             
             # Corrección lineal para forzar y=0 en ambos apoyos
             y1 = y_vals[idx1]
@@ -1294,15 +2344,9 @@ class Viga:
                 y_vals = y_vals - (y1 + pendiente * (x_vals - x1))
         elif n_ap == 1:
             # Un solo apoyo: ajustar para y=0 en ese apoyo
-            idx = np.argmin(np.abs(x_vals - self.apoyos[0].posicion))
+            idx = idx_apoyos[0]
             y_vals = y_vals - y_vals[idx]
 
-        return {
-            "x": [float(v) for v in x_vals],
-            "V": [float(v) for v in V_vals],
-            "M": [float(v) for v in M_vals],
-            "theta": [float(v) for v in theta_vals],
-            "deflexion": [float(v) for v in y_vals],
-        }
+        return _empaquetar_resultados(x_vals, V_vals, M_vals, theta_vals, y_vals)
 
 # Fin del módulo
@@ -60,7 +60,7 @@ from backend.calculos import (
     muestreo_eventos,
     get_event_positions,
 )
-from backend.utils import exportar_tabla, exportar_grafica, asegurar_directorios, convertir_dataframe_export, exportar_configuracion
+from backend.utils import exportar_tabla_rapido, exportar_grafica, asegurar_directorios, convertir_dataframe_export, exportar_configuracion
 from backend.units import (
     LENGTH_UNITS,
     FORCE_UNITS,
@@ -903,7 +903,7 @@ with tabs[0]:
                         
                         if exportar:
                             asegurar_directorios()
-                            ruta_tabla = exportar_tabla(df, "resultados_viga")
+                            ruta_tabla = exportar_tabla_rapido(df, "resultados_viga")
                             ruta_cfg = exportar_configuracion(L, E, I, st.session_state.cargas, nombre="config_viga")
                             st.info(f"CSV guardado en {ruta_tabla}\nConfig JSON en {ruta_cfg}")
                         
@@ -1302,7 +1302,12 @@ Deflexión y = {y_display:.6e} {disp_defl}"""
             st.pyplot(fig3)
 
         st.markdown("### Descargas")
-        df_export = convertir_dataframe_export(df, exp_len, exp_force, exp_defl)
+        # Las unidades de exportación coinciden con las de visualización:
+        # reutilizar df_disp evita una segunda copia convertida
+        if (exp_len, exp_force, exp_defl) == (disp_len, disp_force, disp_defl):
+            df_export = df_disp
+        else:
+            df_export = convertir_dataframe_export(df, exp_len, exp_force, exp_defl)
         st.download_button(
             label=f"⬇️ CSV ({exp_len}, {exp_force}, {exp_defl})",
             data=df_export.to_csv(index=False).encode(),
@@ -1431,7 +1436,7 @@ with tabs[2]:
 
                     # q(x) sobre el mismo mallado xs
                     q_expr = viga_total.intensidad_total()
-                    q_func = sp.lambdify(x_sym, q_expr, "numpy")
+                    q_func = sp.lambdify(x_sym, q_expr, "numpy", cse=True)
                     q_vals = np.asarray(q_func(xs), dtype=float)
 
                     # Construir máscara para ignorar puntos con discontinuidades
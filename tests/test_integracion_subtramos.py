@@ -0,0 +1,21 @@
+"""Pruebas de regresión de ``evaluar_por_subtramos``."""
+
+import numpy as np
+
+from backend.integracion_subtramos import evaluar_por_subtramos
+from backend.viga import Apoyo, CargaMomento, Viga
+
+
+def test_par_en_posicion_no_representable_en_la_malla():
+    """El nodo del par recibe la mitad del salto aunque la malla redondeada
+    lo deje justo antes de la posición (0.1+0.2, 1/3)."""
+    L, M0 = 6.0, 4000.0
+    for a in (0.1 + 0.2, 1.0 / 3.0):
+        viga = Viga(L, 210e9, 1e-5, apoyos=[Apoyo(0.0, "A"), Apoyo(L, "B")])
+        viga.agregar_carga(CargaMomento(M0, a))
+        res = evaluar_por_subtramos(viga)
+
+        i = np.flatnonzero(np.isclose(res["x"], a, atol=1e-12))[0]
+        # Promedio de M(a⁻) = -M0·a/L y M(a⁺) = M0·(1 - a/L)
+        esperado = M0 / 2.0 - M0 * a / L
+        assert np.isclose(res["M"][i], esperado, rtol=1e-9), (a, res["M"][i], esperado)